@@ -0,0 +1,326 @@
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# ------------------------------
+# Shared answer engine
+# ------------------------------
+# Guesses and answers are compared in one normal form: NFKC with accents
+# folded, casefolded, and everything but letters and digits removed, so
+# "Café-Society", "cafe society" and "CAFESOCIETY" are the same answer.
+# Each pack gets a hash index from normal forms (answers, their aliases, and
+# answers without a trailing "(gloss)") to puzzle ids. It is built once per
+# pack, so checking a guess costs one normalisation and one dict lookup.
+#
+# Near misses are graded against Thresholds: a few typos (edit distance on the
+# normal form) or matching the answer's words ("blue green deploy") are
+# accepted or reported as close. grade() knows the puzzle, so it only compares
+# against that puzzle's own answer forms. match() grades a guess against the
+# whole pack through a trigram index over all normal forms (_GramIndex, built
+# on first use), which verifies at most MAX_CANDIDATES forms per lookup
+# however many answers the pack holds. numpy is imported only then, so
+# importing this module and grading guesses stay pure Python.
+
+# accepted alternatives, keyed by answer text (any spelling; keys are normalised too)
+ALIASES: Dict[str, Sequence[str]] = {
+    "go back to square one": ["back to square one", "return to square one"],
+    "reading between the lines": ["read between the lines"],
+    "once in a blue moon": ["blue moon"],
+    "a/b testing": ["ab testing", "a b testing"],
+}
+
+_STRIP = re.compile(r"[\W_]+")
+_GLOSS = re.compile(r"^(.+?)\s*\([^()]*\)\s*$")      # "CQRS (Command Query ...)" -> "CQRS"
+
+CORRECT, CLOSE, WRONG = "correct", "close", "wrong"
+
+GRAM = 3
+MAX_CANDIDATES = 32             # edit distances computed per match() lookup, at most
+
+
+class Thresholds(NamedTuple):
+    """How far a guess may be from an answer and still count (or count as close)."""
+    accept_edits: int = 1       # typos accepted outright...
+    close_edits: int = 3        # ...and still reported as "so close"
+    chars_per_edit: int = 5     # ...but at most one accepted edit per this many characters
+    accept_overlap: float = 1.0 # share of words matched (prefix or one typo) to accept
+    close_overlap: float = 0.5  # ... to report as close
+
+
+def thresholds_from_env(environ=os.environ) -> Thresholds:
+    """REBUS_ACCEPT_EDITS / REBUS_CLOSE_EDITS / REBUS_ACCEPT_OVERLAP / REBUS_CLOSE_OVERLAP."""
+    t = Thresholds()
+    return Thresholds(int(environ.get("REBUS_ACCEPT_EDITS", t.accept_edits)),
+                      int(environ.get("REBUS_CLOSE_EDITS", t.close_edits)), t.chars_per_edit,
+                      float(environ.get("REBUS_ACCEPT_OVERLAP", t.accept_overlap)),
+                      float(environ.get("REBUS_CLOSE_OVERLAP", t.close_overlap)))
+
+
+THRESHOLDS = thresholds_from_env()
+
+
+def _fold(text: str) -> str:
+    text = text or ""
+    if text.isascii():
+        return text.lower().replace("&", "and")
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize("NFKC", folded).casefold().replace("&", "and")
+
+
+def normalize(text: str) -> str:
+    """Comparison form of an answer or guess: 'Café-Society!' -> 'cafesociety'."""
+    return _STRIP.sub("", _fold(text))
+
+
+def words(text: str) -> Tuple[str, ...]:
+    """Normalised words: 'Blue-Green Deployment' -> ('blue', 'green', 'deployment')."""
+    return tuple(w for w in _STRIP.split(_fold(text)) if w)
+
+
+def _pattern(a: str) -> Dict[str, int]:
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    return peq
+
+
+def _levenshtein(a: str, peq: Dict[str, int], b: str) -> int:
+    # Myers/Hyyro bit-parallel edit distance: one pass over b, a's columns packed in an int
+    m = len(a)
+    if not m:
+        return len(b)
+    mask, high = (1 << m) - 1, 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+    return score
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings."""
+    return _levenshtein(a, _pattern(a), b)
+
+
+def _word_match(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    short, long_ = sorted((a, b), key=len)
+    if len(short) >= 4 and long_.startswith(short):      # deploy / deployment
+        return True
+    return len(short) >= 5 and len(long_) - len(short) <= 1 and edit_distance(a, b) <= 1
+
+
+def word_overlap(guess: Sequence[str], answer: Sequence[str]) -> Tuple[float, float]:
+    """(fuzzy, exact): shares of words matched one-to-one, over the longer of the two word lists."""
+    if not guess or not answer:
+        return 0.0, 0.0
+    left = list(answer)
+    hits = exact = 0
+    for g in guess:
+        for k, a in enumerate(left):
+            if _word_match(g, a):
+                hits += 1
+                exact += g == a
+                del left[k]
+                break
+    n = max(len(guess), len(answer))
+    return hits / n, exact / n
+
+
+def _grams(form: str) -> set:
+    padded = f"^{form}$"
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+class _GramIndex:
+    """Trigram inverted index over normal forms, for bounded edit-distance search.
+
+    Postings are keyed by (trigram, form length), so a search only touches
+    forms whose length is within `limit` of the guess. Each edit destroys at
+    most GRAM trigrams of either string, which gives every candidate a lower
+    bound on its distance from the shared trigram count; candidates are
+    verified in that order and the search stops once the bound exceeds the limit.
+    """
+
+    def __init__(self, forms: Iterable[str]):
+        import numpy as np
+        self.forms = sorted(forms, key=len)            # ids in length order: a length window is an id range
+        self.lengths = np.fromiter(map(len, self.forms), dtype=np.int32, count=len(self.forms))
+        ngrams = []
+        postings: Dict[Tuple[str, int], list] = {}
+        for i, form in enumerate(self.forms):
+            grams = _grams(form)
+            ngrams.append(len(grams))
+            for g in grams:
+                postings.setdefault((g, len(form)), []).append(i)
+        self.ngrams = np.array(ngrams, dtype=np.int32)
+        self.postings = {k: np.array(ids, dtype=np.int32) for k, ids in postings.items()}
+
+    def near(self, form: str, limit: int, enough: int = -1) -> List[Tuple[str, int]]:
+        """(form, distance) for indexed forms within `limit` edits, checking at most MAX_CANDIDATES.
+
+        Returns as soon as one within `enough` edits is found.
+        """
+        import numpy as np
+        grams = _grams(form)
+        lengths = range(max(0, len(form) - limit), len(form) + limit + 1)
+        lists = [ids for ids in (self.postings.get((g, n)) for g in grams for n in lengths) if ids is not None]
+        if not lists:
+            return []
+        ids = np.concatenate(lists)
+        lo = int(ids.min())
+        counts = np.bincount(ids - lo)
+        cand = np.flatnonzero(counts >= len(grams) - GRAM * limit)
+        shared = counts[cand]
+        cand += lo
+        bound = -(-np.maximum(len(grams) - shared, self.ngrams[cand] - shared) // GRAM)
+        order = np.lexsort((-shared, bound))[:MAX_CANDIDATES]
+        peq = _pattern(form)
+        out = []
+        for i, b in zip(cand[order].tolist(), bound[order].tolist()):
+            if b > limit:
+                break
+            d = _levenshtein(form, peq, self.forms[i])
+            if d <= limit:
+                out.append((self.forms[i], d))
+                if d <= enough:
+                    break
+        return sorted(out, key=lambda fd: fd[1])
+
+
+class AnswerIndex:
+    """Normal form -> ids of the puzzles it answers, for one pack, plus fuzzy lookups."""
+
+    __slots__ = ("_forms", "_answers", "_grams", "_lock", "puzzles")
+
+    def __init__(self, metas: Iterable[Dict], aliases: Dict[str, Sequence[str]] = ALIASES):
+        by_answer = {normalize(k): [k, *v] for k, v in aliases.items()}
+        forms: Dict[str, Tuple[str, ...]] = {}
+        answers: Dict[str, tuple] = {}
+        n = 0
+        for m in metas:
+            n += 1
+            texts = [m["answer"], *by_answer.get(normalize(m["answer"]), ())]
+            gloss = _GLOSS.match(m["answer"])
+            if gloss:
+                texts.append(gloss.group(1))
+            own = {(normalize(t), words(t)) for t in texts}
+            for form, _ in own:
+                if form:
+                    forms[form] = forms.get(form, ()) + (m["id"],)
+            answers[m["id"]] = answers.get(m["id"], ()) + tuple(own)
+        self._forms = forms
+        self._answers = answers                       # id -> ((form, words), ...) of its answer and aliases
+        self._grams: Optional[_GramIndex] = None     # built on the first match()
+        self._lock = threading.Lock()
+        self.puzzles = n
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    def lookup(self, guess: str) -> Tuple[str, ...]:
+        """Ids of every puzzle `guess` answers exactly."""
+        return self._forms.get(normalize(guess), ())
+
+    def check(self, guess: str, puzzle_id: str) -> bool:
+        return puzzle_id in self.lookup(guess)
+
+    def pairs(self) -> Iterable[Tuple[str, str]]:
+        """Every accepted (puzzle id, normal form)."""
+        return ((pid, f) for pid, own in self._answers.items() for f, _ in own)
+
+    def grade(self, guess: str, puzzle_id: str, t: Thresholds = THRESHOLDS) -> str:
+        """CORRECT, CLOSE or WRONG for `guess` as the answer to `puzzle_id`."""
+        form = normalize(guess)
+        if not form:
+            return WRONG
+        own = self._answers.get(puzzle_id, ())
+        if any(form == f for f, _ in own):
+            return CORRECT
+        peq = _pattern(form)
+        gw = words(guess)
+        verdict = WRONG
+        for f, fw in own:
+            d = _levenshtein(form, peq, f)
+            if d <= min(t.accept_edits, len(f) // t.chars_per_edit):
+                return CORRECT
+            overlap, exact = word_overlap(gw, fw)
+            # word-level acceptance needs one word spelled right: "kube" alone is only close
+            if overlap >= t.accept_overlap and exact:
+                return CORRECT
+            if d <= min(t.close_edits, len(f) // 4) or overlap >= t.close_overlap:
+                verdict = CLOSE
+        return verdict
+
+    def _gram_index(self) -> _GramIndex:
+        if self._grams is None:
+            with self._lock:
+                if self._grams is None:
+                    self._grams = _GramIndex(self._forms)
+        return self._grams
+
+    def near(self, guess: str, limit: int = THRESHOLDS.close_edits,
+             enough: int = -1) -> List[Tuple[str, int, Tuple[str, ...]]]:
+        """(form, edits, puzzle ids) for answers within `limit` edits of `guess`, nearest first."""
+        return [(f, d, self._forms[f]) for f, d in self._gram_index().near(normalize(guess), limit, enough)]
+
+    def match(self, guess: str, t: Thresholds = THRESHOLDS) -> Tuple[str, Tuple[str, ...]]:
+        """Grade `guess` against every answer in the pack: (verdict, ids of the puzzles it (nearly) answers)."""
+        ids = self.lookup(guess)
+        if ids:
+            return CORRECT, ids
+        form = normalize(guess)
+        verdict, hits = WRONG, ()
+        # same length-scaled budgets as grade(); the search radius is the widest of them
+        accept = min(t.accept_edits, len(form) // t.chars_per_edit)
+        for f, d, ids in self.near(form, min(t.close_edits, max(len(form) // 4, accept)), accept):
+            if d <= min(t.accept_edits, len(f) // t.chars_per_edit):
+                return CORRECT, ids
+            if verdict == WRONG and d <= len(f) // 4:
+                verdict, hits = CLOSE, ids
+        return verdict, hits
+
+
+_indexes: Dict[tuple, Tuple[tuple, AnswerIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def _pack_version(pack) -> tuple:
+    path = getattr(pack, "path", None)
+    if path:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+    # built-in list packs are re-created on every rerun around the same PUZZLES list
+    version = getattr(pack, "version", None)
+    if version is not None:
+        return version
+    return tuple((m["id"], m["answer"]) for m in pack.metas())
+
+
+def index_for(pack, aliases: Dict[str, Sequence[str]] = ALIASES) -> AnswerIndex:
+    """Process-wide AnswerIndex for `pack`, rebuilt only when the pack's contents change."""
+    ident = (pack.name, getattr(pack, "path", None), id(aliases))
+    version = _pack_version(pack)
+    with _indexes_lock:
+        cached = _indexes.get(ident)
+    if cached and cached[0] == version:
+        return cached[1]
+    index = AnswerIndex(pack.metas(), aliases)
+    with _indexes_lock:
+        _indexes[ident] = (version, index)
+    return index
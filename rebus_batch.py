@@ -0,0 +1,125 @@
+"""Offline batch renderer: pre-bake every puzzle of every pack to disk.
+
+    python rebus_batch.py --out build/puzzles --format png8 webp:4 --workers 8
+
+Each --format is a rebus_encode spec: png, png8, webp or jpeg, optionally
+followed by :level[:quality[:colors]].
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import rebus_encode
+
+# pack name -> (module holding PUZZLES, draw function in that module)
+PACKS = {
+    "tech": ("rebus_pack_tech", "draw_puzzle"),
+    "company": ("rebus_pack_company", "draw_puzzle"),
+    "hard": ("rebus_pack_hard", "draw_canvas"),
+}
+
+_modules: Dict[str, object] = {}
+
+
+def load_pack(name: str):
+    if name not in _modules:
+        _modules[name] = importlib.import_module(PACKS[name][0])
+    return _modules[name]
+
+
+def _init_worker(packs: List[str]):
+    import rebus_engine  # noqa: F401 -- the pack modules import the renderer on first draw; pay it here
+    for name in packs:
+        load_pack(name)
+
+
+def render_one(task: Tuple[str, int, List[str], str, int, int, float]) -> Dict:
+    pack, index, formats, out_dir, w, h, scale = task
+    mod = load_pack(pack)
+    puz = mod.PUZZLES[index]
+    t0 = time.perf_counter()
+    img = getattr(mod, PACKS[pack][1])(puz["layout"], w=w, h=h, scale=scale)
+    render_ms = (time.perf_counter() - t0) * 1000
+    files = {}
+    for spec in formats:
+        enc = rebus_encode.parse(spec)
+        data, encode_ms = rebus_encode.timed_encode(img, enc)
+        name = f"{hashlib.sha256(data).hexdigest()[:20]}.{enc.ext}"
+        path = os.path.join(out_dir, name)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        files[spec] = {"file": name, "bytes": len(data), "encode_ms": round(encode_ms, 3)}
+    return {"pack": pack, "id": puz["id"], "index": index, "files": files,
+            "render_ms": round(render_ms, 3), "total_ms": round((time.perf_counter() - t0) * 1000, 3)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render every puzzle to content-addressed image files.")
+    ap.add_argument("--packs", nargs="+", choices=sorted(PACKS), default=list(PACKS))
+    ap.add_argument("--out", default="build/puzzles")
+    ap.add_argument("--format", nargs="+", default=["png"], dest="formats", help="encoding specs, e.g. png8 webp:4")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunksize", type=int, default=0, help="tasks per worker round-trip (0 = auto)")
+    ap.add_argument("--render-mode", choices=["rgb", "palette"], default=None,
+                    help="override REBUS_RENDER_MODE (palette renders 'P' images)")
+    ap.add_argument("--width", type=int, default=1100)
+    ap.add_argument("--height", type=int, default=650)
+    ap.add_argument("--scale", type=float, default=1.0, help="output size / layout size, e.g. 0.29 for thumbnails")
+    args = ap.parse_args(argv)
+    for spec in args.formats:
+        try:
+            rebus_encode.parse(spec)
+        except ValueError as exc:
+            ap.error(str(exc))
+
+    if args.render_mode:
+        # workers read it at import (spawn) or inherit the module value (fork)
+        os.environ["REBUS_RENDER_MODE"] = args.render_mode
+        import rebus_engine
+        rebus_engine.RENDER_MODE = args.render_mode
+    os.makedirs(args.out, exist_ok=True)
+    tasks = [(pack, i, args.formats, args.out, args.width, args.height, args.scale)
+             for pack in args.packs for i in range(len(load_pack(pack).PUZZLES))]
+    chunksize = args.chunksize or max(1, len(tasks) // (args.workers * 8))
+
+    results = []
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.packs,)) as pool:
+        for n, rec in enumerate(pool.map(render_one, tasks, chunksize=chunksize), 1):
+            results.append(rec)
+            if n % 25 == 0 or n == len(tasks):
+                rate = n / (time.perf_counter() - t0)
+                print(f"\r{n}/{len(tasks)} puzzles  {rate:.1f}/s", end="", file=sys.stderr, flush=True)
+    elapsed = time.perf_counter() - t0
+    print(file=sys.stderr)
+
+    render_ms = sorted(r["render_ms"] for r in results)
+    summary = {
+        "puzzles": len(results),
+        "unique_files": len({f["file"] for r in results for f in r["files"].values()}),
+        "workers": args.workers,
+        "elapsed_s": round(elapsed, 3),
+        "puzzles_per_s": round(len(results) / elapsed, 1) if elapsed else None,
+        "render_ms_p50": render_ms[len(render_ms) // 2] if render_ms else None,
+        "render_ms_max": render_ms[-1] if render_ms else None,
+        "bytes_by_format": {spec: sum(r["files"][spec]["bytes"] for r in results) for spec in args.formats},
+    }
+    with open(os.path.join(args.out, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump({"summary": summary, "puzzles": results}, fh, ensure_ascii=False, indent=1)
+    for rec in sorted(results, key=lambda r: -r["render_ms"])[:5]:
+        print(f"slowest  {rec['pack']}/{rec['id']}: {rec['render_ms']:.1f} ms", file=sys.stderr)
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Headless benchmark suite: rendering, encoding, fonts and answer checking.
+
+    python rebus_bench.py --save bench/baseline.json
+    python rebus_bench.py --compare bench/baseline.json
+    python rebus_bench.py --packs tech --repeat 9 --top 20
+
+Every puzzle of every built-in pack is drawn with its pack's draw function,
+cold (layout compiled from scratch, fonts already loaded) and warm (compiled
+layout cached, as after the first view), then encoded as the default PNG.
+Font loading is timed cold (font caches cleared) and warm for every text
+size the pack uses. Answer checking is timed for building the pack's answer
+index, and for checking, grading and matching an exact, a misspelt and a
+wrong guess for every puzzle. Each time is the fastest of --repeat runs, and
+the whole suite is run --rounds times, packs interleaved, keeping the best
+round of every metric: on a shared machine, slow spells last seconds.
+
+A separate pass per pack runs under tracemalloc and records the Python heap
+peak and what stays allocated afterwards. It also records the image buffers
+the renderer allocated, counted by rebus_engine, because tracemalloc does not
+see Pillow's pixel memory.
+
+Results are one JSON file: flat "metrics" (name -> value, lower is better)
+and per-puzzle times. --compare flags every metric that is more than
+--threshold (relative) worse than the baseline, ignoring changes below the
+metric's noise floor, and exits 1 if anything regressed. Flagged timings
+are measured for another --rounds passes first, so only a slowdown that
+persists counts. Baselines are only comparable on the same machine.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import PIL
+
+import rebus_answers
+import rebus_batch
+import rebus_encode
+import rebus_engine
+import rebus_fonts
+import rebus_packs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FORMAT_VERSION = 1
+THRESHOLD = 0.15
+# changes smaller than this (by the metric's unit suffix) are noise, whatever the ratio
+FLOORS = {"ms": 0.05, "us": 0.5, "kb": 64, "bytes": 0, "allocs": 0}
+WRONG_GUESS = "definitely not the answer"
+
+
+def _best_ms(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> float:
+    times = []
+    fn()                                                # first call pays for imports and lazy indexes
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times)                                   # the least disturbed run
+
+
+def _pack(name: str) -> Tuple[List[Dict], Callable]:
+    mod = rebus_batch.load_pack(name)
+    return mod.PUZZLES, getattr(mod, rebus_batch.PACKS[name][1])
+
+
+def bench_fonts(name: str, repeat: int) -> Dict[str, float]:
+    puzzles, _ = _pack(name)
+    profile = getattr(rebus_engine, name.upper())   # the packs draw with rebus_engine.TECH / COMPANY / HARD
+    sizes = sorted({it.get("size", 64) for p in puzzles for it in p["layout"] if "shape" not in it})
+
+    def load_all():
+        for size in sizes:
+            rebus_fonts.get_font(size, profile.font_names, profile.font_dir)
+
+    cold = _best_ms(load_all, repeat, setup=rebus_fonts.clear_caches)
+    warm = _best_ms(load_all, repeat)
+    return {f"font.{name}.cold_ms": cold, f"font.{name}.warm_us": warm * 1000 / len(sizes)}
+
+
+def bench_render(name: str, repeat: int) -> List[Dict]:
+    puzzles, draw = _pack(name)
+    for p in puzzles:                                   # load fonts (and emoji) outside the timings
+        draw(p["layout"])
+    rows = []
+    for p in puzzles:
+        layout = p["layout"]
+        cold = _best_ms(lambda: draw(layout), repeat, setup=rebus_engine.clear_caches)
+        warm = _best_ms(lambda: draw(layout), repeat)
+        img = draw(layout)
+        encode = _best_ms(lambda: rebus_encode.encode(img), repeat)
+        rows.append({"pack": name, "id": p["id"], "cold_ms": round(cold, 3), "warm_ms": round(warm, 3),
+                     "encode_ms": round(encode, 3), "png_bytes": len(rebus_encode.encode(img))})
+    return rows
+
+
+def render_totals(name: str, rows: Sequence[Dict]) -> Dict[str, float]:
+    rows = [r for r in rows if r["pack"] == name]
+    return {
+        f"render.{name}.cold_ms": sum(r["cold_ms"] for r in rows),
+        f"render.{name}.warm_ms": sum(r["warm_ms"] for r in rows),
+        f"encode.{name}.png_ms": sum(r["encode_ms"] for r in rows),
+        f"encode.{name}.png_bytes": sum(r["png_bytes"] for r in rows),
+    }
+
+
+def _guesses(answer: str) -> Tuple[str, ...]:
+    mid = len(answer) // 2
+    return answer, answer[:mid] + answer[mid + 1:], WRONG_GUESS      # exact, one letter dropped, wrong
+
+
+def bench_answers(name: str, repeat: int) -> Dict[str, float]:
+    puzzles, _ = _pack(name)
+    pack = rebus_packs.ListPack(puzzles, name)
+
+    def build():
+        index = rebus_answers.AnswerIndex(pack.metas())
+        index.match(WRONG_GUESS)                        # builds the trigram index too
+        return index
+
+    build_ms = _best_ms(build, repeat)
+    index = build()
+    guesses = [(p["id"], g) for p in puzzles for g in _guesses(p["answer"])]
+    per_guess = 1000 / len(guesses)
+    return {
+        f"answers.{name}.index_ms": build_ms,
+        f"answers.{name}.check_us": _best_ms(lambda: [index.check(g, pid) for pid, g in guesses], repeat) * per_guess,
+        f"answers.{name}.grade_us": _best_ms(lambda: [index.grade(g, pid) for pid, g in guesses], repeat) * per_guess,
+        f"answers.{name}.match_us": _best_ms(lambda: [index.match(g) for _, g in guesses], repeat) * per_guess,
+    }
+
+
+def bench_memory(name: str) -> Dict[str, float]:
+    """Allocations of drawing and encoding the whole pack from cold compiled-layout caches."""
+    puzzles, draw = _pack(name)
+    rebus_engine.clear_caches()
+    gc.collect()
+    before = rebus_engine.render_stats()
+    tracemalloc.start()
+    for p in puzzles:
+        rebus_encode.encode(draw(p["layout"]))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = rebus_engine.render_stats()
+    images = {k: after[k] - before[k] for k in ("render_allocs", "compile_allocs", "render_bytes", "compile_bytes")}
+    return {
+        f"memory.{name}.py_peak_kb": peak / 1024,
+        f"memory.{name}.py_retained_kb": current / 1024,
+        f"memory.{name}.image_allocs": images["render_allocs"] + images["compile_allocs"],
+        f"memory.{name}.image_kb": (images["render_bytes"] + images["compile_bytes"]) / 1024,
+    }
+
+
+def _meta(repeat: int, rounds: int) -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "pillow": PIL.__version__, "machine": platform.machine(), "node": platform.node(),
+            "cpus": os.cpu_count(), "render_mode": rebus_engine.RENDER_MODE, "repeat": repeat, "rounds": rounds}
+
+
+def _keep_best(best: Dict, new: Dict, keys: Sequence[str]):
+    for k in keys:
+        best[k] = min(best[k], new[k]) if k in best else new[k]
+
+
+TIMED = ("font", "answers", "render")     # benchmark groups that are timed, so rerunnable; encode is in render
+
+
+def _timed_pass(plan: Dict[str, Set[str]], repeat: int, metrics: Dict[str, float], puzzles: Dict[Tuple, Dict]):
+    for name, groups in plan.items():
+        if "font" in groups:
+            m = bench_fonts(name, repeat)
+            _keep_best(metrics, m, list(m))
+        if "answers" in groups:
+            m = bench_answers(name, repeat)
+            _keep_best(metrics, m, list(m))
+        if "render" in groups:
+            for r in bench_render(name, repeat):
+                _keep_best(puzzles.setdefault((r["pack"], r["id"]), dict(r)), r, ("cold_ms", "warm_ms", "encode_ms"))
+            metrics.update(render_totals(name, list(puzzles.values())))
+
+
+def run(packs: Sequence[str], repeat: int = 3, rounds: int = 3) -> Dict:
+    """Best of `rounds` passes over the timed benchmarks (`repeat` runs each), then one memory pass."""
+    metrics: Dict[str, float] = {}
+    puzzles: Dict[Tuple[str, str], Dict] = {}
+    # whole passes, packs interleaved: a slow spell of the machine spoils one round, not one metric
+    for _ in range(rounds):
+        _timed_pass({name: set(TIMED) for name in packs}, repeat, metrics, puzzles)
+    for name in packs:
+        metrics.update(bench_memory(name))
+    metrics["process.max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"version": FORMAT_VERSION, "meta": _meta(repeat, rounds),
+            "metrics": {k: round(v, 3) for k, v in metrics.items()}, "puzzles": list(puzzles.values())}
+
+
+def recheck(results: Dict, names: Sequence[str], repeat: int = 3, rounds: int = 3) -> Dict:
+    """`results` with the benchmark groups of the timed metrics `names` run `rounds` more times (best kept)."""
+    plan: Dict[str, Set[str]] = {}
+    for name in names:
+        group, pack = name.split(".")[:2]
+        group = "render" if group == "encode" else group
+        if group in TIMED:
+            plan.setdefault(pack, set()).add(group)
+    metrics = dict(results["metrics"])
+    puzzles = {(r["pack"], r["id"]): dict(r) for r in results["puzzles"]}
+    for _ in range(rounds):
+        _timed_pass(plan, repeat, metrics, puzzles)
+    return {**results, "metrics": {k: round(v, 3) for k, v in metrics.items()}, "puzzles": list(puzzles.values())}
+
+
+def compare(base: Dict[str, float], new: Dict[str, float], threshold: float = THRESHOLD) -> List[Dict]:
+    """One row per metric: base, new, relative change and status (ok, regressed, improved, new, missing)."""
+    rows = []
+    for name in sorted(set(base) | set(new)):
+        b, n = base.get(name), new.get(name)
+        if b is None or n is None:
+            rows.append({"metric": name, "base": b, "new": n, "change": None,
+                         "status": "new" if b is None else "missing"})
+            continue
+        delta = n - b
+        change = delta / b if b else None
+        status = "ok"
+        if abs(delta) > FLOORS.get(name.rsplit("_", 1)[-1], 0) and (change is None or abs(change) > threshold):
+            status = "regressed" if delta > 0 else "improved"
+        rows.append({"metric": name, "base": b, "new": n,
+                     "change": round(change, 3) if change is not None else None, "status": status})
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark rendering, encoding, fonts and answer checking.")
+    ap.add_argument("--packs", nargs="+", choices=sorted(rebus_batch.PACKS), default=list(rebus_batch.PACKS))
+    ap.add_argument("--repeat", type=int, default=3, help="runs per timing and round; the fastest is kept")
+    ap.add_argument("--rounds", type=int, default=3, help="passes over the whole suite; the best of them is kept")
+    ap.add_argument("--top", type=int, default=10, help="slowest puzzles to list")
+    ap.add_argument("--save", metavar="PATH", help="write the results (e.g. a new baseline) here")
+    ap.add_argument("--compare", metavar="BASELINE", help="flag regressions against this results file")
+    ap.add_argument("--results", metavar="PATH", help="with --compare: compare this saved run instead of running")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD, help="relative change that counts (0.15 = 15%%)")
+    args = ap.parse_args(argv)
+
+    if args.results:
+        with open(args.results, encoding="utf-8") as fh:
+            results = json.load(fh)
+    else:
+        results = run(args.packs, args.repeat, args.rounds)
+
+    rows = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        for key in ("python", "pillow", "machine", "node", "cpus", "render_mode"):
+            if baseline["meta"].get(key) != results["meta"].get(key):
+                print(f"warning: baseline {key} is {baseline['meta'].get(key)!r}, "
+                      f"this run {results['meta'].get(key)!r}", file=sys.stderr)
+        rows = compare(baseline["metrics"], results["metrics"], args.threshold)
+        flagged = [r["metric"] for r in rows if r["status"] == "regressed"]
+        if flagged and not args.results:
+            # a regression has to survive more rounds; a slow spell of the machine does not
+            print(f"rechecking {len(flagged)} regressed metrics", file=sys.stderr)
+            results = recheck(results, flagged, args.repeat, args.rounds)
+            rows = compare(baseline["metrics"], results["metrics"], args.threshold)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, ensure_ascii=False, indent=1)
+
+    for r in sorted(results["puzzles"], key=lambda r: -r["cold_ms"])[:args.top]:
+        print(f"slowest  {r['pack']}/{r['id']}: {r['cold_ms']:.2f} ms cold, {r['warm_ms']:.2f} ms warm, "
+              f"{r['encode_ms']:.2f} ms encode")
+    if not args.compare:
+        for name, value in results["metrics"].items():
+            print(f"{name:<34} {value:>12}")
+        return
+    for r in rows:
+        if r["status"] in ("regressed", "improved", "new"):
+            change = f"{r['change']:+.1%}" if r["change"] is not None else ""
+            print(f"{r['status']:<9}  {r['metric']:<34} {r['base']!s:>12} -> {r['new']!s:<12} {change}")
+    regressed = sum(r["status"] == "regressed" for r in rows)
+    print(f"{regressed} regressed, {sum(r['status'] == 'improved' for r in rows)} improved, "
+          f"{sum(r['status'] == 'ok' for r in rows)} unchanged, {sum(r['status'] == 'missing' for r in rows)} not run "
+          f"(threshold {args.threshold:.0%}, baseline {baseline['meta'].get('commit') or '?'})")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Binary, memory-mapped puzzle packs for large puzzle sets.
+
+Layout of a .rbp file (little endian):
+
+    header   44 bytes   magic b"RBPK", version u16, flags u16, count u32,
+                        table offset u64, data offset u64, dictionary length u32,
+                        metadata offset u64, metadata length u32
+    zdict    up to 32 KiB of sample records, the shared zlib preset dictionary
+    table    count x 16 bytes: record offset u64, stored length u32, raw length u32
+    meta     zlib-compressed UTF-8 JSON, {"ids": [...], "answers": [...], "hints": [...]}
+    records  zlib-compressed UTF-8 JSON, one per puzzle:
+             {"id", "answer", "hint", "layout"}
+
+Records are a few hundred bytes of near-identical JSON, which zlib alone
+barely shrinks; compressing each against the shared dictionary makes them
+about 3x smaller while keeping every record independently decodable.
+
+Opening a pack maps the file and reads the header, so startup cost and
+resident memory do not depend on the number of puzzles. Fetching puzzle N
+reads one table slot and inflates one record. Listing puzzles or building
+the answer index (meta/metas) inflates only the metadata table, once per
+open, as FilePack reads only its index. Read-only maps share pages
+through the OS page cache, so worker processes serving the same pack hold a
+single copy.
+
+    python rebus_binpack.py convert --out packs tech company hard
+    python rebus_binpack.py convert --out packs packs/extra.pack.jsonl
+    python rebus_binpack.py bench packs/tech.rbp --module rebus_pack_tech
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import threading
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List
+
+MAGIC = b"RBPK"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIQQIQI")
+SLOT = struct.Struct("<QII")
+LEVEL = 9
+ZDICT_SIZE = 32 * 1024          # zlib's window; larger presets are ignored
+RECORD_CACHE_SIZE = int(os.environ.get("REBUS_LAYOUT_CACHE", 512))
+
+
+class BinPack:
+    """Random-access reader over a .rbp file; same interface as rebus_packs.FilePack."""
+
+    def __init__(self, path: str, cache_size: int = RECORD_CACHE_SIZE):
+        self.path = path
+        self.name = os.path.basename(path).split(".")[0]
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = struct.unpack_from("<4sH", self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path}: not a version {VERSION} rebus pack; re-convert it with rebus_binpack.py convert")
+        _, _, _, self._count, self._table, self._data, zlen, self._meta_at, self._meta_len = \
+            HEADER.unpack_from(self._mm, 0)
+        self._zdict = self._mm[HEADER.size:HEADER.size + zlen]
+        self._load = lru_cache(maxsize=cache_size)(self._read)
+        self._lock = threading.Lock()
+        self._meta = None                               # (ids, answers, hints), read on first use
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> Dict:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._load(i)
+
+    def meta(self, i: int) -> Dict:
+        ids, answers, hints = self._columns()
+        return {"id": ids[i], "answer": answers[i], "hint": hints[i]}
+
+    def layout(self, i: int) -> List[Dict]:
+        return self[i]["layout"]
+
+    def metas(self) -> Iterator[Dict]:
+        for i, a, h in zip(*self._columns()):
+            yield {"id": i, "answer": a, "hint": h}
+
+    def _columns(self):
+        if self._meta is None:
+            with self._lock:
+                if self._meta is None:
+                    cols = json.loads(zlib.decompress(self._mm[self._meta_at:self._meta_at + self._meta_len]))
+                    self._meta = (cols["ids"], cols["answers"], cols["hints"])
+        return self._meta
+
+    def _read(self, i: int) -> Dict:
+        offset, stored, _raw = SLOT.unpack_from(self._mm, self._table + i * SLOT.size)
+        inflate = zlib.decompressobj(zdict=self._zdict)
+        return json.loads(inflate.decompress(self._mm[offset:offset + stored]) + inflate.flush())
+
+    def stats(self) -> Dict[str, int]:
+        info = self._load.cache_info()
+        return {"puzzles": self._count, "layouts_loaded": info.currsize, "hits": info.hits,
+                "misses": info.misses, "maxsize": info.maxsize, "file_bytes": len(self._mm)}
+
+    def close(self):
+        """Unmap the file. Only for a pack this caller opened itself, never one from rebus_packs.open_pack."""
+        with self._lock:
+            self._load.cache_clear()
+            self._mm.close()
+
+
+def build_zdict(raws: List[bytes], size: int = ZDICT_SIZE) -> bytes:
+    # evenly spaced sample records; zlib matches nearer the end more cheaply, so order doesn't matter much
+    size = min(size, sum(map(len, raws)) // 8)       # small packs: don't outweigh the records
+    step = max(1, len(raws) * 400 // max(size, 1))
+    return b"".join(raws[::step])[-size:]
+
+
+def _deflate(raw: bytes, zdict: bytes, level: int) -> bytes:
+    deflate = zlib.compressobj(level, zdict=zdict)
+    return deflate.compress(raw) + deflate.flush()
+
+
+def write_binpack(puzzles: Iterable[Dict], path: str, level: int = LEVEL) -> int:
+    puzzles = [{"id": p["id"], "answer": p["answer"], "hint": p.get("hint", ""), "layout": p["layout"]}
+               for p in puzzles]
+    raws = [json.dumps(p, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for p in puzzles]
+    meta = zlib.compress(json.dumps({"ids": [p["id"] for p in puzzles], "answers": [p["answer"] for p in puzzles],
+                                     "hints": [p["hint"] for p in puzzles]},
+                                    ensure_ascii=False, separators=(",", ":")).encode("utf-8"), level)
+    zdict = build_zdict(raws)
+    records = [(_deflate(raw, zdict, level), len(raw)) for raw in raws]
+    table = HEADER.size + len(zdict)
+    meta_at = table + SLOT.size * len(records)
+    data = meta_at + len(meta)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, VERSION, 0, len(records), table, data, len(zdict), meta_at, len(meta)))
+        fh.write(zdict)
+        offset = data
+        for blob, raw_len in records:
+            fh.write(SLOT.pack(offset, len(blob), raw_len))
+            offset += len(blob)
+        fh.write(meta)
+        for blob, _ in records:
+            fh.write(blob)
+    os.replace(tmp, path)
+    return len(records)
+
+
+_BENCH = {
+    "module": "import resource, time; t = time.perf_counter(); import {arg} as m; n = len(m.PUZZLES); "
+              "p = m.PUZZLES[n // 2]; ",
+    "binpack": "import resource, time; t = time.perf_counter(); import rebus_binpack as b; "
+               "pk = b.BinPack({arg!r}); n = len(pk); p = pk[n // 2]; ",
+}
+_REPORT = ("print(round((time.perf_counter() - t) * 1000, 2), n, "
+           "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+
+
+def bench(path: str, module: str = "") -> List[Dict]:
+    """Cold load time and max RSS (fresh interpreter each) for the .rbp vs importing `module`."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = [("binpack", path)] + ([("module", module)] if module else [])
+    results = []
+    for kind, arg in runs:
+        code = _BENCH[kind].format(arg=arg) + _REPORT
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True, check=True)
+        ms, n, rss = out.stdout.split()
+        results.append({"source": f"{kind}:{arg}", "puzzles": int(n), "load_ms": float(ms),
+                        "max_rss_kb": int(rss)})
+    return results
+
+
+def main(argv=None):
+    import rebus_packs
+    ap = argparse.ArgumentParser(description="Convert puzzle packs to .rbp and benchmark loading them.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    cv = sub.add_parser("convert", help="built-in pack names or .pack.jsonl paths -> .rbp")
+    cv.add_argument("sources", nargs="+")
+    cv.add_argument("--out", default=rebus_packs.PACK_DIR)
+    bn = sub.add_parser("bench", help="load time / RSS of a .rbp vs importing a PUZZLES module")
+    bn.add_argument("path")
+    bn.add_argument("--module", default="", help="e.g. rebus_pack_tech")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "convert":
+        os.makedirs(args.out, exist_ok=True)
+        for src in args.sources:
+            if src in rebus_packs.BUILTIN:
+                import importlib
+                name, puzzles = src, importlib.import_module(rebus_packs.BUILTIN[src]).PUZZLES
+            else:
+                pack = rebus_packs.FilePack(src)
+                name, puzzles = pack.name, (pack[i] for i in range(len(pack)))
+            dest = os.path.join(args.out, f"{name}.rbp")
+            n = write_binpack(puzzles, dest)
+            print(f"{src}: {n} puzzles -> {dest} ({os.path.getsize(dest)} bytes)")
+    else:
+        for row in bench(args.path, args.module):
+            print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import rebus_encode
+import rebus_metrics
+from rebus_encode import Policy
+
+# ------------------------------
+# Process-wide rendered-puzzle cache
+# ------------------------------
+# Encoded images are keyed by a content hash of the layout plus every render
+# parameter, so the same layout in two packs (or two sessions) is rendered and
+# encoded once. Entries are evicted least-recently-used once the byte budget
+# is exceeded.
+
+DEFAULT_BUDGET_MB = 64
+
+
+def layout_key(layout: List[Dict], **params: Any) -> str:
+    payload = json.dumps({"layout": layout, "params": params}, sort_keys=True,
+                         ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self.nbytes += len(data)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= len(evicted)
+                self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """Drop every entry and reset the counters, so stats() describes the cache from here on."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.nbytes, "max_bytes": self.max_bytes}
+
+
+RENDER_CACHE = RenderCache(int(float(os.environ.get("REBUS_RENDER_CACHE_MB", DEFAULT_BUDGET_MB)) * 2**20))
+
+
+def image_key(layout: List[Dict], renderer: str, w: int = 1100, h: int = 650, bg: str = "#0b1220",
+              fg: str = "#e7edf7", policy: Optional[Policy] = None, scale: float = 1.0) -> str:
+    """The cache key cached_image() stores `layout` under."""
+    return layout_key(layout, renderer=renderer, w=w, h=h, bg=bg, fg=fg, policy=policy or rebus_encode.POLICY,
+                      scale=scale)
+
+
+def cached_image(draw_fn: Callable, layout: List[Dict], renderer: str, label: str = "",
+                 w: int = 1100, h: int = 650, bg: str = "#0b1220", fg: str = "#e7edf7",
+                 policy: Optional[Policy] = None, scale: float = 1.0,
+                 cache: RenderCache = RENDER_CACHE) -> bytes:
+    """Encoded image bytes for `layout`, rendered with `draw_fn` only on a cache miss.
+
+    `renderer` names the draw function's behaviour (fonts, border, ...) and is
+    part of the key, so two renderers never share an entry for the same layout.
+    The encoding policy (default: rebus_encode.POLICY) is part of the key too;
+    `label` (usually the puzzle id) is what the encode log records it under,
+    and the puzzle label of the render-stage metrics. Every `scale` (output
+    size / design size) is cached separately.
+    """
+    policy = policy or rebus_encode.POLICY
+    key = image_key(layout, renderer, w, h, bg, fg, policy, scale)
+    data = cache.get(key)
+    if data is None:
+        with rebus_metrics.context(app=renderer, puzzle=label or key[:12]), rebus_metrics.span("image"):
+            img = draw_fn(layout, w=w, h=h, bg=bg, fg=fg, scale=scale)
+            with rebus_metrics.span("encode"):
+                data, _ = policy.encode(img, label or key[:12])
+        cache.put(key, data)
+    return data
+
+
+def cached_png(draw_fn: Callable, layout: List[Dict], renderer: str, w: int = 1100, h: int = 650,
+               bg: str = "#0b1220", fg: str = "#e7edf7", cache: RenderCache = RENDER_CACHE) -> bytes:
+    """PNG bytes for `layout` at default compression, whatever the app policy is."""
+    return cached_image(draw_fn, layout, renderer, w=w, h=h, bg=bg, fg=fg,
+                        policy=Policy(rebus_encode.DEFAULT), cache=cache)
@@ -0,0 +1,250 @@
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont, features
+
+import rebus_fonts
+import rebus_metrics
+
+# ------------------------------
+# Emoji sprite atlas
+# ------------------------------
+# Emoji used to go through the text path. Every item was emojized, then
+# FreeType drew each codepoint with the monochrome NotoEmoji.ttf at the
+# item's size. Without a shaping engine (raqm), a ZWJ sequence such as 👩‍💻
+# or 🏃‍♂️ came out as its fragments side by side.
+#
+# Now split() cuts text, once per distinct string, into plain runs and emoji
+# clusters. Only sequences (ZWJ, U+FE0F, keycaps, flags, modifiers) and
+# codepoints with emoji presentation count as emoji; text-style symbols
+# such as → ↔ ▶ ✖ stay text and go to the font. Each cluster is rasterised
+# once per size bucket into the atlas (the "emoji" stage in rebus_metrics).
+# Compiling a layout only resamples the sprite to the item's size, and that
+# is memoised too. Rendering pastes the sprite like any other coverage mask,
+# so emoji cost about what plain text costs. preload() fills the atlas for a
+# built-in pack when it is loaded; data-file packs fill it as puzzles are
+# prefetched.
+#
+# Colour: with a colour emoji font (REBUS_EMOJI_FONT, or NotoColorEmoji.ttf
+# in fonts/ or a system font directory), sprites are RGBA and keep their
+# colours. They are fitted to the monochrome glyph's box, so layouts do not
+# move. Without one, sprites are NotoEmoji coverage masks drawn in the
+# item's colour. Bitmap colour fonts only load at their strike sizes, so
+# their glyphs are drawn at a strike and resampled.
+#
+# Sequences: with raqm, a cluster is shaped as one glyph if the font has
+# one. Without raqm, modifiers (skin tones, gender signs, variation
+# selectors) are dropped. The remaining parts are composed: the first at
+# full size, the rest as badges on its lower right (👩‍💻 is a woman with a
+# laptop badge).
+
+MONO_FONT = os.path.join(rebus_fonts.FONT_DIR, "NotoEmoji.ttf")
+COLOR_FONTS = (
+    os.environ.get("REBUS_EMOJI_FONT", ""),
+    os.path.join(rebus_fonts.FONT_DIR, "NotoColorEmoji.ttf"),
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+)
+COLOR_STRIKES = (109, 160, 136, 128, 96, 64)   # CBDT/sbix strikes; outline colour fonts load at the first
+
+BUCKETS = (32, 64, 128, 256, 512)              # atlas sizes (px); a sprite is resampled down from the next one up
+BADGE_SCALE = 0.55                             # badge height / base glyph height in composed sequences
+
+SPLIT_CACHE_SIZE = 16384
+ATLAS_SIZE = 2048                              # (cluster, bucket) sprites
+SPRITE_CACHE_SIZE = 8192                       # (cluster, px) resampled sprites
+
+ZWJ = "\u200d"
+_MODIFIERS = frozenset("\ufe0e\ufe0f\u20e3") | frozenset(map(chr, range(0x1F3FB, 0x1F400)))
+_GENDER = frozenset("\u2640\u2642")
+_NO_GLYPH = "\U0010fffd"                      # private use: every font draws its .notdef for it
+
+
+class Sprite(NamedTuple):
+    image: Image.Image              # "L" coverage mask, or "RGBA" for a colour emoji
+    offset: Tuple[int, int]         # top-left of the image from the pen position on the baseline
+    advance: int                    # pen advance past the cluster
+
+    @property
+    def color(self) -> bool:
+        return self.image.mode == "RGBA"
+
+
+@lru_cache(maxsize=SPLIT_CACHE_SIZE)
+def split(text: str, shortcodes: bool = False) -> Tuple[Tuple[bool, str], ...]:
+    """(is emoji, run) pieces of `text`; `shortcodes` expands :name: emoji first."""
+    # nothing below U+203C is an emoji on its own (©/® and keycaps need a U+FE0F)
+    if max(text, default=" ") < "\u203c" and not (shortcodes and ":" in text):
+        return ((False, text),)
+    import emoji
+    if shortcodes:
+        text = emoji.emojize(text)
+    out, at = [], 0
+    for m in emoji.emoji_list(text):
+        if not _is_emoji(m["emoji"]):
+            continue
+        if m["match_start"] > at:
+            out.append((False, text[at:m["match_start"]]))
+        out.append((True, m["emoji"]))
+        at = m["match_end"]
+    if at < len(text) or not out:
+        out.append((False, text[at:]))
+    return tuple(out)
+
+
+def _is_emoji(cluster: str) -> bool:
+    """Drawn as emoji: a sequence (ZWJ, U+FE0F, keycap, flag, modifier) or an Emoji_Presentation codepoint.
+
+    Text-presentation symbols that emoji_list also matches (→ ↔ ▶ ✖) stay text, for the font chain.
+    """
+    import emoji
+    if len(cluster) > 1:
+        return True
+    data = emoji.EMOJI_DATA.get(cluster)
+    return data is not None and data["status"] == emoji.STATUS["fully_qualified"]
+
+
+def _parts(cluster: str) -> Tuple[str, ...]:
+    """The glyphs to compose for `cluster` when it cannot be shaped as one."""
+    pieces = cluster.split(ZWJ)
+    out = []
+    for piece in pieces:
+        kept = "".join(c for c in piece if c not in _MODIFIERS)
+        if kept and not (len(pieces) > 1 and kept in _GENDER):
+            out.append(kept)
+    return tuple(out) or (cluster,)
+
+
+@lru_cache(maxsize=None)
+def _shaping() -> bool:
+    return features.check("raqm")
+
+
+@lru_cache(maxsize=None)
+def _color_font() -> Optional[ImageFont.FreeTypeFont]:
+    for path in COLOR_FONTS:
+        if not path or not os.path.exists(path):
+            continue
+        for size in COLOR_STRIKES:
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:                             # not one of this bitmap font's strikes
+                continue
+    return None
+
+
+def _glyph(font, text: str, color: bool) -> Optional[Tuple[Image.Image, Tuple[int, int], int]]:
+    """`text` drawn with `font`, cropped to its ink: (image, ink top-left, advance); None if it has no glyph."""
+    mode = "RGBA" if color else "L"
+    x0, y0, x1, y1 = font.getbbox(text, mode=mode)
+    img = Image.new(mode, (max(1, x1 - x0), max(1, y1 - y0)))
+    ImageDraw.Draw(img).text((-x0, -y0), text, font=font, fill=(255, 255, 255, 255) if color else 255,
+                             embedded_color=color)
+    if color and (img.getbbox() is None or (text != _NO_GLYPH and _is_notdef(font, img))):
+        return None
+    return img, (x0, y0), round(font.getlength(text))
+
+
+def _is_notdef(font, img: Image.Image) -> bool:
+    notdef = _glyph(font, _NO_GLYPH, True)
+    return notdef is not None and notdef[0].size == img.size and notdef[0].tobytes() == img.tobytes()
+
+
+def _compose(font, cluster: str, color: bool) -> Optional[Sprite]:
+    pieces = (cluster,) if _shaping() else _parts(cluster)
+    glyphs = [_glyph(font, p, color) for p in pieces]
+    if any(g is None for g in glyphs):
+        return None
+    img, (x, y), advance = glyphs[0]
+    if len(glyphs) == 1:
+        return Sprite(img, (x, y), advance)
+    bh = max(1, round(img.height * BADGE_SCALE))
+    badges = [b.resize((max(1, round(b.width * bh / b.height)), bh), Image.LANCZOS) for b, _, _ in glyphs[1:]]
+    # badges overhang the base's lower right corner by a tenth of their height, laid right to left
+    right, bottom = img.width + bh // 10, img.height + bh // 10
+    places, r = [], right
+    for b in badges:
+        places.append((r - b.width, bottom - b.height))
+        r -= b.width * 4 // 5
+    left = min(0, min(bx for bx, _ in places))
+    canvas = Image.new(img.mode, (max(img.width, right) - left, bottom))
+    canvas.paste(img, (-left, 0))
+    for b, (bx, by) in zip(badges, places):
+        at = (bx - left, by)
+        if color:
+            canvas.alpha_composite(b, at)
+        else:
+            canvas.paste(0, at, b.filter(ImageFilter.MaxFilter(5)))   # knock the base out around the badge
+            canvas.paste(255, at, b)
+    return Sprite(canvas, (x + left, y), advance)
+
+
+@lru_cache(maxsize=ATLAS_SIZE)
+def _raster(cluster: str, bucket: int) -> Sprite:
+    with rebus_metrics.span("emoji"):
+        font = rebus_fonts.load_font(MONO_FONT, bucket)
+        mono = _compose(font, cluster, False)
+        mono = mono._replace(offset=(mono.offset[0], mono.offset[1] - font.getmetrics()[0]))
+        cfont = _color_font()
+        sp = _compose(cfont, cluster, True) if cfont is not None else None
+        if sp is None:
+            return mono
+        # colour glyphs have their own metrics: fit them to the monochrome glyph's box
+        h = mono.image.height
+        w = max(1, round(sp.image.width * h / sp.image.height))
+        x = mono.offset[0] + (mono.image.width - w) // 2
+        return Sprite(sp.image.resize((w, h), Image.LANCZOS), (x, mono.offset[1]), mono.advance)
+
+
+@lru_cache(maxsize=SPRITE_CACHE_SIZE)
+def sprite(cluster: str, px: int) -> Sprite:
+    """`cluster` at font size `px`: the atlas sprite of the next bucket up, resampled."""
+    bucket = next((b for b in BUCKETS if b >= px), BUCKETS[-1])
+    sp = _raster(cluster, bucket)
+    if bucket == px:
+        return sp
+    f = px / bucket
+    img = sp.image.resize((max(1, round(sp.image.width * f)), max(1, round(sp.image.height * f))), Image.LANCZOS)
+    return Sprite(img, (round(sp.offset[0] * f), round(sp.offset[1] * f)), round(sp.advance * f))
+
+
+_preloaded = set()
+_preload_lock = threading.Lock()
+
+
+def preload(name: str, puzzles: Iterable[Dict], shortcodes: bool = False, scale: float = 1.0) -> int:
+    """Rasterise every emoji of pack `name` into the atlas, once per process; returns the emoji seen."""
+    with _preload_lock:
+        if name in _preloaded:
+            return 0
+        _preloaded.add(name)
+    n = 0
+    for p in puzzles:
+        for it in p["layout"]:
+            if "shape" in it:
+                continue
+            for is_emoji, run in split(it.get("text", ""), shortcodes):
+                if is_emoji:
+                    sprite(run, max(1, int(round(it.get("size", 64) * scale))))
+                    n += 1
+    return n
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for name, fn in (("split", split), ("atlas", _raster), ("sprites", sprite)):
+        info = fn.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+    return stats
+
+
+def clear_caches():
+    sprite.cache_clear()
+    _raster.cache_clear()
+    split.cache_clear()
+    with _preload_lock:
+        _preloaded.clear()
@@ -0,0 +1,179 @@
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from PIL import Image
+
+# ------------------------------
+# Image encoding pipeline
+# ------------------------------
+# Puzzles are near two-colour text on a flat background, so a small palette
+# PNG or lossless WebP is usually far smaller than the default 24-bit PNG.
+# An Encoding names one format + settings. choose() picks one automatically
+# from a byte or millisecond target, and every encode is recorded (bytes and
+# ms per label) for reporting.
+
+
+class Encoding(NamedTuple):
+    format: str = "png"       # png | png8 | webp | jpeg
+    level: int = 6            # PNG compress_level (0-9) / WebP method (0-6)
+    quality: int = 100        # WebP/JPEG quality; WebP is lossless at 100
+    colors: int = 32          # palette size for png8
+
+    @property
+    def mime(self) -> str:
+        return MIME[self.format]
+
+    @property
+    def ext(self) -> str:
+        return "jpg" if self.format == "jpeg" else "png" if self.format == "png8" else self.format
+
+
+MIME = {"png": "image/png", "png8": "image/png", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+DEFAULT = Encoding()
+# auto mode tries these, lossless first; lossy formats only when allowed
+CANDIDATES = (
+    Encoding("png8", level=6),
+    Encoding("png8", level=1),
+    Encoding("webp", level=4),
+    Encoding("png", level=6),
+    Encoding("png", level=1),
+)
+LOSSY_CANDIDATES = (Encoding("webp", level=4, quality=85), Encoding("jpeg", quality=85))
+
+LOG_SIZE = 1024
+
+
+def parse(spec: str) -> Encoding:
+    """'png', 'png:9', 'png8:6:32', 'webp:4:80', 'jpeg::85' -> Encoding."""
+    fmt, *rest = spec.strip().lower().split(":")
+    if fmt not in MIME:
+        raise ValueError(f"unknown image format: {fmt!r}")
+    fields = {}
+    for name, value in zip(("level", "quality", "colors"), rest):
+        if value:
+            fields[name] = int(value)
+    if fmt == "jpeg" and "quality" not in fields:
+        fields["quality"] = 85
+    return Encoding(fmt, **fields)
+
+
+def save_kwargs(enc: Encoding) -> Dict:
+    if enc.format in ("png", "png8"):
+        return {"format": "PNG", "compress_level": enc.level}
+    if enc.format == "webp":
+        if enc.quality >= 100:
+            return {"format": "WEBP", "lossless": True, "method": enc.level, "quality": 100}
+        return {"format": "WEBP", "quality": enc.quality, "method": enc.level}
+    return {"format": "JPEG", "quality": enc.quality, "optimize": enc.level >= 6}
+
+
+def encode(img: Image.Image, enc: Encoding = DEFAULT) -> bytes:
+    if enc.format == "png8" and img.mode != "P":
+        img = img.quantize(colors=enc.colors, method=Image.Quantize.FASTOCTREE)
+    elif enc.format == "jpeg" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, **save_kwargs(enc))
+    return buf.getvalue()
+
+
+def timed_encode(img: Image.Image, enc: Encoding) -> Tuple[bytes, float]:
+    t0 = time.perf_counter()
+    data = encode(img, enc)
+    return data, (time.perf_counter() - t0) * 1000
+
+
+def choose(img: Image.Image, target_bytes: Optional[int] = None, target_ms: Optional[float] = None,
+           lossy: bool = False, candidates: Sequence[Encoding] = CANDIDATES) -> Tuple[Encoding, bytes, float]:
+    """Encode `img` with every candidate and pick one.
+
+    With `target_ms`, the smallest payload encoded within the time budget wins;
+    with `target_bytes`, the fastest encode that fits the byte budget. With both,
+    both must hold. If nothing qualifies (or no target), the smallest payload wins.
+    """
+    trials = [(enc,) + timed_encode(img, enc) for enc in tuple(candidates) + (LOSSY_CANDIDATES if lossy else ())]
+    ok = [t for t in trials
+          if (target_bytes is None or len(t[1]) <= target_bytes) and (target_ms is None or t[2] <= target_ms)]
+    if ok and target_bytes is not None and target_ms is None:
+        return min(ok, key=lambda t: t[2])
+    return min(ok or trials, key=lambda t: len(t[1]))
+
+
+class EncodeLog:
+    """Bounded record of the last encode per label, plus per-format totals."""
+
+    def __init__(self, size: int = LOG_SIZE):
+        self.size = size
+        self._recent: "OrderedDict[str, Dict]" = OrderedDict()
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, enc: Encoding, nbytes: int, ms: float):
+        with self._lock:
+            self._recent.pop(label, None)
+            self._recent[label] = {"format": enc.format, "level": enc.level, "quality": enc.quality,
+                                   "bytes": nbytes, "ms": round(ms, 3)}
+            while len(self._recent) > self.size:
+                self._recent.popitem(last=False)
+            tot = self._totals.setdefault(enc.format, {"count": 0, "bytes": 0, "ms": 0.0})
+            tot["count"] += 1
+            tot["bytes"] += nbytes
+            tot["ms"] += ms
+
+    def recent(self) -> Dict[str, Dict]:
+        with self._lock:
+            return dict(self._recent)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {fmt: {"count": t["count"], "bytes": t["bytes"], "ms": round(t["ms"], 3),
+                          "avg_bytes": t["bytes"] // t["count"], "avg_ms": round(t["ms"] / t["count"], 3)}
+                    for fmt, t in self._totals.items()}
+
+
+ENCODE_LOG = EncodeLog()
+
+
+class Policy(NamedTuple):
+    """What the apps encode with: a fixed Encoding, or auto-choice against targets."""
+    encoding: Optional[Encoding] = DEFAULT
+    target_bytes: Optional[int] = None
+    target_ms: Optional[float] = None
+    lossy: bool = False
+
+    def encode(self, img: Image.Image, label: str = "", log: EncodeLog = ENCODE_LOG) -> Tuple[bytes, Encoding]:
+        if self.encoding is not None:
+            enc = self.encoding
+            data, ms = timed_encode(img, enc)
+        else:
+            enc, data, ms = choose(img, self.target_bytes, self.target_ms, self.lossy)
+        log.record(label, enc, len(data), ms)
+        return data, enc
+
+
+def policy_from_env(environ=os.environ) -> Policy:
+    """REBUS_IMAGE_FORMAT=png|png8|webp|jpeg[:level[:quality[:colors]]] or 'auto'
+    (with REBUS_TARGET_KB / REBUS_TARGET_MS / REBUS_ALLOW_LOSSY=1)."""
+    spec = environ.get("REBUS_IMAGE_FORMAT", "png")
+    if spec.strip().lower() != "auto":
+        return Policy(parse(spec))
+    kb = environ.get("REBUS_TARGET_KB")
+    ms = environ.get("REBUS_TARGET_MS")
+    return Policy(None, int(float(kb) * 1024) if kb else None, float(ms) if ms else None,
+                  environ.get("REBUS_ALLOW_LOSSY", "") == "1")
+
+
+POLICY = policy_from_env()
+
+
+def encode_stats() -> Dict[str, object]:
+    return {"policy": POLICY._asdict(), "formats": ENCODE_LOG.stats()}
+
+
+def recent_encodes() -> List[Tuple[str, Dict]]:
+    return list(ENCODE_LOG.recent().items())
@@ -0,0 +1,519 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+import rebus_emoji
+import rebus_fallback
+import rebus_fonts
+import rebus_metrics
+import rebus_stroke
+from rebus_cache import layout_key
+from rebus_fonts import text_bbox
+
+# ------------------------------
+# Shared rendering engine
+# ------------------------------
+# A layout (list of item dicts) is compiled once into a tuple of draw commands
+# with fonts, metrics, anchors and box geometry already resolved; rendering is
+# then a loop over those commands. Compiled layouts are memoised by content,
+# so Streamlit re-executing the app script (and rebuilding PUZZLES) still
+# reuses them.
+#
+# Item keys understood by the compiler:
+#   text items:  text, xy, size, align (center|left|right), color, opacity,
+#                rotate, underline, dashed, box {pad, radius, fill, outline,
+#                width, dashed}
+#   shape items: shape (line|box), xyxy, width, color, radius, dashed
+# Any dashed stroke also accepts "dash": [on, off, ...] and "dash_offset".
+# Emoji in text are drawn from rebus_emoji's sprite atlas, not from the font;
+# characters the profile's font lacks come from rebus_fallback's font chain.
+#
+# Compiling is timed as the "layout" stage and painting as "raster" (text,
+# lines, boxes) plus "composite" (coverage-mask and sprite pastes, palette mapping); see
+# rebus_metrics.
+
+
+class Profile(NamedTuple):
+    name: str
+    border: int = 8
+    font_names: Tuple[str, ...] = rebus_fonts.SYSTEM_FONTS
+    font_dir: Optional[str] = None
+    emojize: bool = False
+
+
+TECH = Profile("tech")
+COMPANY = Profile("company", font_names=("NotoSans.ttf",), font_dir=rebus_fonts.FONT_DIR, emojize=True)
+HARD = Profile("hard", border=10)
+
+TEXT_BOX_DASH = (12, 8)
+SHAPE_BOX_DASH = (18, 12)
+LINE_DASH = (16, 10)
+
+COMPILE_CACHE_SIZE = 4096
+
+# Output widths offered by the apps. Layouts stay in 1100x650 design units and
+# are compiled per scale, so each size is its own compiled + cached entry.
+SIZES = {"thumb": 320, "phone": 720, "laptop": 1100, "hd": 1920, "4k": 3840}
+
+# "rgb" renders 24-bit canvases; "palette" renders "P" images (see render_palette)
+RENDER_MODE = os.environ.get("REBUS_RENDER_MODE", "rgb")
+
+
+def scale_for(size: str, w: int = 1100) -> float:
+    return SIZES[size] / w
+
+
+def size_for_client(user_agent: str = "") -> str:
+    """Best default size for a browser, from its User-Agent."""
+    ua = (user_agent or "").lower()
+    return "phone" if any(t in ua for t in ("mobi", "iphone", "android")) else "laptop"
+
+
+def rgba(color, opacity: int = 255) -> Tuple[int, int, int, int]:
+    r, g, b = (ImageColor.getrgb(color) if isinstance(color, str) else color)[:3]
+    return (r, g, b, opacity)
+
+
+_stats = {"renders": 0, "render_allocs": 0, "render_bytes": 0, "peak_render_bytes": 0,
+          "compile_allocs": 0, "compile_bytes": 0}
+_stats_lock = threading.Lock()
+_pending = threading.local()
+_PIXEL_BYTES = {"1": 1, "L": 1, "P": 1, "RGB": 4, "RGBA": 4}
+
+
+def _new_image(mode: str, size: Tuple[int, int], color, phase: str) -> Image.Image:
+    """Image.new that counts allocations and bytes, per render or per compile."""
+    img = Image.new(mode, size, color)
+    nbytes = size[0] * size[1] * _PIXEL_BYTES.get(mode, 4)
+    if phase == "render":
+        _pending.allocs = getattr(_pending, "allocs", 0) + 1
+        _pending.nbytes = getattr(_pending, "nbytes", 0) + nbytes
+    else:
+        with _stats_lock:
+            _stats["compile_allocs"] += 1
+            _stats["compile_bytes"] += nbytes
+    return img
+
+
+# ------------------------------
+# Draw commands
+# ------------------------------
+class Segments:
+    __slots__ = ("segments", "fill", "width")
+
+    def __init__(self, segments, fill, width):
+        self.segments = segments
+        self.fill = fill
+        self.width = width
+
+    def colors(self):
+        return (self.fill,)
+
+    def draw(self, img, draw, ink=None):
+        fill = self.fill if ink is None else ink
+        for seg in self.segments:
+            draw.line(seg, fill=fill, width=self.width)
+
+
+class Coverage:
+    """Pre-rasterised coverage masks in one colour (dashed strokes, rotated or translucent text, emoji)."""
+    __slots__ = ("pieces", "fill")
+
+    def __init__(self, pieces, fill):
+        self.pieces = pieces          # ((xy, L mask), ...)
+        self.fill = fill
+
+    def colors(self):
+        return (self.fill,)
+
+    def draw(self, img, draw, ink=None):
+        fill = self.fill if ink is None else ink
+        for xy, mask in self.pieces:
+            img.paste(fill, xy, mask)
+
+
+class RoundedRect:
+    __slots__ = ("xyxy", "radius", "outline", "width", "fill")
+
+    def __init__(self, xyxy, radius, outline, width, fill=None):
+        self.xyxy = xyxy
+        self.radius = radius
+        self.outline = outline
+        self.width = width
+        self.fill = fill
+
+    def colors(self):
+        return tuple(c for c in (self.outline, self.fill) if c is not None)
+
+    def draw(self, img, draw, ink=None):
+        outline, fill = self.outline, self.fill
+        if ink is not None:
+            outline = None if outline is None else ink
+            fill = None if fill is None else ink
+        draw.rounded_rectangle(self.xyxy, radius=self.radius, outline=outline,
+                               width=self.width, fill=fill)
+
+
+class Text:
+    """Opaque, unrotated text drawn straight onto the canvas."""
+    __slots__ = ("text", "font", "fill", "xy", "underline")
+
+    def __init__(self, text, font, fill, xy, underline):
+        self.text = text
+        self.font = font
+        self.fill = fill
+        self.xy = xy
+        self.underline = underline    # (xyxy, width) on the canvas, or None
+
+    def colors(self):
+        return (self.fill,)
+
+    def draw(self, img, draw, ink=None):
+        fill = self.fill if ink is None else ink
+        draw.text(self.xy, self.text, font=self.font, fill=fill)
+        if self.underline:
+            draw.line(self.underline[0], fill=fill, width=self.underline[1])
+
+
+class Sprite:
+    """Pre-rasterised RGBA image (colour emoji), pasted through its alpha."""
+    __slots__ = ("xy", "rgb", "alpha", "inks")
+
+    def __init__(self, xy, image):
+        self.xy = xy
+        self.rgb = image.convert("RGB")
+        self.alpha = image.getchannel("A")
+        counts = image.getcolors(image.width * image.height)
+        self.inks = tuple(c[:3] for _, c in sorted(counts, reverse=True) if c[3])[:16]
+
+    def colors(self):
+        return self.inks
+
+    def draw(self, img, draw, ink=None):
+        img.paste(self.rgb if ink is None else ink, self.xy, self.alpha)
+
+
+class CompiledLayout(NamedTuple):
+    size: Tuple[int, int]
+    bg: str
+    commands: Tuple[Any, ...]
+    inks: Tuple[Tuple[int, int, int], ...]    # distinct RGB colours the commands paint with
+
+
+# ------------------------------
+# Compiler
+# ------------------------------
+def _px(v, scale: float) -> int:
+    return int(round(v * scale))
+
+
+def _stroke_px(v, scale: float) -> int:
+    return max(1, int(round(v * scale)))
+
+
+def _dashed_stroke(path, it: Dict, default_dash, color, width: int, scale: float) -> Coverage:
+    dash = tuple(d * scale for d in it.get("dash", default_dash))
+    pieces = rebus_stroke.dashed_masks(path, dash, width, it.get("dash_offset", 0) * scale)
+    return Coverage(tuple(pieces), color)
+
+
+def _compile_shape(it: Dict, fg: str, scale: float) -> Any:
+    sh = it["shape"]
+    width = _stroke_px(it.get("width", 4), scale)
+    color = it.get("color", fg)
+    if sh == "line":
+        x1, y1, x2, y2 = (_px(v, scale) for v in it.get("xyxy", [100, 100, 100, 200]))
+        if it.get("dashed", False):
+            return _dashed_stroke(rebus_stroke.line_path(x1, y1, x2, y2), it, LINE_DASH, color, width, scale)
+        return Segments(((x1, y1, x2, y2),), color, width)
+    if sh == "box":
+        xyxy = tuple(_px(v, scale) for v in it.get("xyxy", [300, 200, 800, 480]))
+        radius = _px(it.get("radius", 18), scale)
+        if it.get("dashed", False):
+            return _dashed_stroke(rebus_stroke.rect_path(*xyxy, radius), it, SHAPE_BOX_DASH, color, width, scale)
+        return RoundedRect(xyxy, radius, color, width)
+    raise ValueError(f"unknown shape: {sh!r}")
+
+
+class TextPlacement(NamedTuple):
+    text: str                              # as drawn (emojized for profiles that ask for it)
+    font: Any                              # the profile's font; fallback runs carry their own
+    bbox: Tuple[int, int, int, int]
+    origin: Tuple[int, int]                # (tx, ty): top-left of the measured text box
+    runs: Tuple[Tuple[int, int, Any, Any], ...]   # (x, y from the origin, text run or rebus_emoji.Sprite, font)
+    advance: int
+
+
+def _measure(text: str, font, profile: Profile):
+    """(text, runs, bbox, advance) of `text`: emoji clusters as atlas sprites, the rest split by fallback font."""
+    pieces = rebus_emoji.split(text, profile.emojize)
+    chain = rebus_fallback.chain(profile.font_names, profile.font_dir)
+    if len(pieces) == 1 and not pieces[0][0]:
+        segments = rebus_fallback.segments(text, chain)
+        if len(segments) == 1 and segments[0][0] == 0:
+            return text, ((0, 0, text, font),), text_bbox(font, text), round(font.getlength(text))
+    ascent = font.getmetrics()[0]
+    x, runs, boxes = 0, [], []
+    for is_emoji, run in pieces:
+        if is_emoji:
+            sp = rebus_emoji.sprite(run, font.size)
+            runs.append((x, ascent, sp, None))
+            sx, sy = x + sp.offset[0], ascent + sp.offset[1]
+            boxes.append((sx, sy, sx + sp.image.width, sy + sp.image.height))
+            x += sp.advance
+            continue
+        for i, seg in rebus_fallback.segments(run, chain):
+            f = font if i == 0 else rebus_fonts.load_font(chain[i], font.size)
+            dy = ascent - f.getmetrics()[0]         # on the profile font's baseline
+            b = text_bbox(f, seg)
+            runs.append((x, dy, seg, f))
+            if b[2] > b[0]:
+                boxes.append((x + b[0], dy + b[1], x + b[2], dy + b[3]))
+            x += round(f.getlength(seg))
+    bbox = tuple(f(v) for f, v in zip((min, min, max, max), zip(*boxes))) if boxes else (0, 0, 0, 0)
+    return "".join(run for _, run in pieces), tuple(runs), bbox, x
+
+
+def place_text(it: Dict, profile: Profile, w: int = 1100, h: int = 650, scale: float = 1.0) -> TextPlacement:
+    """Resolve a text item's string, font and position, as every backend draws it."""
+    x, y = (_px(v, scale) for v in it.get("xy", [w // 2, h // 2]))
+    align = it.get("align", "center")
+    font = rebus_fonts.get_font(_stroke_px(it.get("size", 64), scale), profile.font_names, profile.font_dir)
+
+    text, runs, bbox, advance = _measure(it.get("text", ""), font, profile)
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    if align == "center":
+        tx, ty = x - tw // 2, y - th // 2
+    elif align == "left":
+        tx, ty = x, y - th // 2
+    else:
+        tx, ty = x - tw, y - th // 2
+    return TextPlacement(text, font, bbox, (tx, ty), runs, advance)
+
+
+def _compile_text(it: Dict, profile: Profile, w: int, h: int, fg: str, scale: float) -> List[Any]:
+    cmds = []
+    text, font, bbox, (tx, ty), runs, _ = place_text(it, profile, w, h, scale)
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    size = it.get("size", 64)
+    color = it.get("color", fg)
+
+    box = it.get("box")
+    if box:
+        pad = _px(box.get("pad", 16), scale)
+        rx1, ry1 = tx - pad, ty - pad
+        rx2, ry2 = tx + tw + pad, ty + th + pad
+        outline = box.get("outline", color)
+        width = _stroke_px(box.get("width", 2), scale)
+        radius = _px(box.get("radius", 12), scale)
+        if box.get("dashed", it.get("dashed", False)):
+            if box.get("fill"):
+                cmds.append(RoundedRect((rx1, ry1, rx2, ry2), radius, None, 0, box["fill"]))
+            path = rebus_stroke.rect_path(rx1, ry1, rx2, ry2, radius)
+            cmds.append(_dashed_stroke(path, {**it, **box}, TEXT_BOX_DASH, outline, width, scale))
+        else:
+            cmds.append(RoundedRect((rx1, ry1, rx2, ry2), radius, outline, width, box.get("fill")))
+
+    # text is drawn 2px in from (tx, ty), as the original scratch-image renderers did
+    inset = _px(2, scale)
+    ox, oy = tx + inset, ty + inset
+    ink = [ox + bbox[0], oy + bbox[1], ox + bbox[2], oy + bbox[3]]
+    underline = None
+    if it.get("underline", False):
+        uw = _stroke_px(max(2, size // 16), scale)
+        gap = _px(1, scale)
+        ul = (tx, ty + th + gap, tx + tw, ty + th + gap)
+        ink = [min(ink[0], ul[0]), min(ink[1], ul[1] - uw), max(ink[2], ul[2]), max(ink[3], ul[3] + uw)]
+        underline = (ul, uw)
+    fill = rgba(color)[:3]
+    opacity, rotate = it.get("opacity", 255), it.get("rotate", 0)
+    if opacity >= 255 and not rotate:
+        if len(runs) == 1 and isinstance(runs[0][2], str):
+            dx, dy, run, f = runs[0]
+            cmds.append(Text(run, f, fill, (ox + dx, oy + dy), underline))
+            return cmds
+        masks = []
+        for dx, dy, run, f in runs:
+            if isinstance(run, str):
+                if run.strip():
+                    cmds.append(Text(run, f, fill, (ox + dx, oy + dy), None))
+            elif run.color:
+                cmds.append(Sprite((ox + dx + run.offset[0], oy + dy + run.offset[1]), run.image))
+            else:
+                masks.append(((ox + dx + run.offset[0], oy + dy + run.offset[1]), run.image))
+        if masks:
+            cmds.append(Coverage(tuple(masks), fill))
+        if underline:
+            cmds.append(Segments((underline[0],), fill, underline[1]))
+        return cmds
+
+    # translucent/rotated text: rasterise its coverage once, into a layer sized to the ink
+    # (colour emoji go to an RGBA layer of the same size, turned and faded alike)
+    lx, ly = int(ink[0]) - 2, int(ink[1]) - 2
+    layer = _new_image("L", (int(ink[2]) - lx + 3, int(ink[3]) - ly + 3), 0, "compile")
+    color_layer = None
+    ld = ImageDraw.Draw(layer)
+    for dx, dy, run, f in runs:
+        at = (ox + dx - lx, oy + dy - ly)
+        if isinstance(run, str):
+            ld.text(at, run, font=f, fill=opacity)
+        elif run.color:
+            if color_layer is None:
+                color_layer = _new_image("RGBA", layer.size, (0, 0, 0, 0), "compile")
+            color_layer.alpha_composite(run.image, (at[0] + run.offset[0], at[1] + run.offset[1]))
+        else:
+            layer.paste(opacity, (at[0] + run.offset[0], at[1] + run.offset[1]), run.image)
+    if underline:
+        ul, uw = underline
+        ld.line((ul[0] - lx, ul[1] - ly, ul[2] - lx, ul[3] - ly), fill=opacity, width=uw)
+    if color_layer is not None and opacity < 255:
+        color_layer.putalpha(color_layer.getchannel("A").point(lambda a: a * opacity // 255))
+    if rotate:
+        w0, h0 = layer.size
+        layer = layer.rotate(rotate, expand=True)
+        if color_layer is not None:
+            color_layer = color_layer.rotate(rotate, expand=True)
+        lx += (w0 - layer.width) // 2
+        ly += (h0 - layer.height) // 2
+    cmds.append(Coverage((((lx, ly), layer),), fill))
+    if color_layer is not None:
+        cmds.append(Sprite((lx, ly), color_layer))
+    return cmds
+
+
+def compile_layout(layout: List[Dict], profile: Profile, w: int = 1100, h: int = 650,
+                   bg: str = "#0b1220", fg: str = "#e7edf7", scale: float = 1.0) -> CompiledLayout:
+    """Compile `layout` (coordinates in w x h design units) for a canvas scaled by `scale`."""
+    sw, sh = _px(w, scale), _px(h, scale)
+    b = _px(profile.border, scale)
+    cmds: List[Any] = [RoundedRect((b, b, sw - b, sh - b), _px(24, scale), fg, _stroke_px(2, scale))]
+    for it in layout:
+        if "shape" in it:
+            cmds.append(_compile_shape(it, fg, scale))
+        else:
+            cmds.extend(_compile_text(it, profile, w, h, fg, scale))
+    inks = dict.fromkeys(rgba(c)[:3] for cmd in cmds for c in cmd.colors())
+    return CompiledLayout((sw, sh), bg, tuple(cmds), tuple(inks))
+
+
+_compiled: "OrderedDict[str, CompiledLayout]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def get_compiled(layout: List[Dict], profile: Profile, w: int = 1100, h: int = 650,
+                 bg: str = "#0b1220", fg: str = "#e7edf7", scale: float = 1.0) -> CompiledLayout:
+    key = layout_key(layout, renderer=profile, w=w, h=h, bg=bg, fg=fg, scale=scale)
+    with _compiled_lock:
+        cl = _compiled.get(key)
+        if cl is not None:
+            _compiled.move_to_end(key)
+            return cl
+    with rebus_metrics.span("layout"):
+        cl = compile_layout(layout, profile, w, h, bg, fg, scale)
+    with _compiled_lock:
+        _compiled[key] = cl
+        while len(_compiled) > COMPILE_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return cl
+
+
+def clear_caches():
+    with _compiled_lock:
+        _compiled.clear()
+
+
+# ------------------------------
+# Renderer
+# ------------------------------
+def _paint(cl: CompiledLayout, mode: str, bg, ink) -> Image.Image:
+    _pending.allocs = _pending.nbytes = 0
+    img = _new_image(mode, cl.size, bg, "render")
+    draw = ImageDraw.Draw(img)
+    t0 = t = time.perf_counter()
+    composite = 0.0
+    for cmd in cl.commands:
+        cmd.draw(img, draw, ink)
+        now = time.perf_counter()
+        if type(cmd) is Coverage or type(cmd) is Sprite:
+            composite += now - t
+        t = now
+    rebus_metrics.record_stage("raster", (t - t0 - composite) * 1000, t0)
+    if composite:
+        rebus_metrics.record_stage("composite", composite * 1000)
+    with _stats_lock:
+        _stats["renders"] += 1
+        _stats["render_allocs"] += _pending.allocs
+        _stats["render_bytes"] += _pending.nbytes
+        _stats["peak_render_bytes"] = max(_stats["peak_render_bytes"], _pending.nbytes)
+    return img
+
+
+def render(cl: CompiledLayout) -> Image.Image:
+    return _paint(cl, "RGB", cl.bg, None)
+
+
+def _ramp(bg, ink, n: int) -> List[int]:
+    # same rounding as PIL's mask blend, so ramp entry i == bg blended with ink at coverage i
+    out = []
+    for i in range(n):
+        a = i * 255 // (n - 1)
+        for c0, c1 in zip(bg, ink):
+            v = c0 * (255 - a) + c1 * a + 128
+            out.append((v + (v >> 8)) >> 8)
+    return out
+
+
+def render_palette(cl: CompiledLayout) -> Image.Image:
+    """Render to a "P" image whose palette is bg -> ink anti-aliasing ramps.
+
+    A layout painting with a single ink is rasterised straight into an 8-bit
+    coverage buffer and the ramp is attached as its palette, which is
+    identical to the RGB render (up to 1 level where anti-aliased edges overlap).
+    Layouts with several inks render in RGB and keep their exact colours when
+    there are at most 256 of them; otherwise the 255 most common are kept and
+    rare blends snap to the nearest kept colour.
+    """
+    bg = rgba(cl.bg)[:3]
+    if len(cl.inks) == 1 and cl.inks[0] != bg:
+        img = _paint(cl, "L", 0, 255)
+        img.putpalette(_ramp(bg, cl.inks[0], 256))
+        return img
+    rgb = np.asarray(render(cl))
+    t0 = time.perf_counter()
+    keys = ((rgb[..., 0].astype(np.uint32) << 16) | (rgb[..., 1].astype(np.uint32) << 8) | rgb[..., 2]).ravel()
+    bg_key = (bg[0] << 16) | (bg[1] << 8) | bg[2]
+    ink = keys != bg_key                      # most of the canvas is background; keep it out of the sort
+    used, inverse = np.unique(keys[ink], return_inverse=True)
+    colors = np.column_stack(((used >> 16) & 255, (used >> 8) & 255, used & 255)).astype(np.int32)
+    if len(used) < 256:
+        palette = np.vstack(([bg], colors))
+        lut = np.arange(1, len(used) + 1)
+    else:
+        # keep the 255 most common colours; snap the rare blends to their nearest kept one
+        keep = np.argsort(np.bincount(inverse))[::-1][:255]
+        palette = np.vstack(([bg], colors[keep]))
+        lut = ((colors[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    index = np.zeros(keys.shape, dtype=np.uint8)
+    index[ink] = lut[inverse]
+    img = Image.fromarray(index.reshape(rgb.shape[:2]), "L")
+    img.putpalette(palette.astype(np.uint8).ravel().tolist())
+    rebus_metrics.record_stage("composite", (time.perf_counter() - t0) * 1000, t0)
+    return img
+
+
+def render_stats() -> Dict[str, int]:
+    """Image allocations made while rendering and while compiling (counts and bytes)."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def draw_layout(layout: List[Dict], profile: Profile, w: int = 1100, h: int = 650,
+                bg: str = "#0b1220", fg: str = "#e7edf7", mode: Optional[str] = None,
+                scale: float = 1.0) -> Image.Image:
+    cl = get_compiled(layout, profile, w, h, bg, fg, scale)
+    return render_palette(cl) if (mode or RENDER_MODE) == "palette" else render(cl)
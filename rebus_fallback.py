@@ -0,0 +1,203 @@
+import os
+import struct
+import threading
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import rebus_fonts
+
+# ------------------------------
+# Per-codepoint font fallback
+# ------------------------------
+# A profile names one text font, but puzzle text also holds arrows, box
+# drawing, maths and symbols (→ ⟶ ─ ∅ ✓) that the font may not have. Those
+# used to come out as tofu, and the company profile drew Latin words with
+# an emoji font. Text is now split into same-font segments over a fallback
+# chain: the profile's font, then the bundled FALLBACK fonts. Each codepoint
+# goes to the first font in the chain whose cmap maps it.
+#
+# A font's cmap (formats 4 and 12, read straight from the file) is turned
+# into sorted codepoint ranges once per process. Per-chain lookups are
+# memoised, so segmenting a string is one dict lookup per character, and
+# the segmentation itself is cached per (string, chain). Whitespace,
+# combining marks and format characters stay in the current segment, so a
+# space between two symbols does not start a new run. Codepoints that no
+# font has stay with the profile's font (tofu, as before).
+
+FALLBACK = ("NotoSans.ttf", "DejaVuSans.ttf", "NotoSansSymbols2-Regular.ttf", "NotoEmoji.ttf")
+SEGMENT_CACHE_SIZE = 16384
+
+_NEUTRAL = ("Zs", "Mn", "Me", "Cf", "Cc")       # categories that never start a new segment
+_CMAP_PREFERENCE = ((3, 10, 12), (0, 6, 12), (0, 4, 12), (3, 1, 4), (0, 3, 4), (0, 2, 4), (0, 1, 4), (0, 0, 4))
+
+
+class FontCoverage:
+    """Codepoints one font file maps to a glyph, as sorted (first, last) ranges."""
+    __slots__ = ("path", "starts", "ends")
+
+    def __init__(self, path: str, ranges: Sequence[Tuple[int, int]]):
+        self.path = path
+        self.starts = [a for a, _ in ranges]
+        self.ends = [b for _, b in ranges]
+
+    def __contains__(self, cp: int) -> bool:
+        i = bisect_right(self.starts, cp) - 1
+        return i >= 0 and cp <= self.ends[i]
+
+    def __len__(self) -> int:
+        return sum(b - a + 1 for a, b in zip(self.starts, self.ends))
+
+
+def _format4(data: bytes, at: int):
+    n = struct.unpack_from(">H", data, at + 6)[0] // 2
+    ends = struct.unpack_from(f">{n}H", data, at + 14)
+    starts = struct.unpack_from(f">{n}H", data, at + 16 + 2 * n)
+    deltas = struct.unpack_from(f">{n}h", data, at + 16 + 4 * n)
+    offsets_at = at + 16 + 6 * n
+    offsets = struct.unpack_from(f">{n}H", data, offsets_at)
+    for i, (start, end, delta, offset) in enumerate(zip(starts, ends, deltas, offsets)):
+        if start == 0xFFFF:
+            continue
+        if offset == 0:
+            for cp in range(start, end + 1):
+                if (cp + delta) & 0xFFFF:
+                    yield cp
+            continue
+        glyphs_at = offsets_at + 2 * i + offset
+        glyphs = struct.unpack_from(f">{end - start + 1}H", data, glyphs_at)
+        for cp, glyph in zip(range(start, end + 1), glyphs):
+            if glyph:
+                yield cp
+
+
+def _format12(data: bytes, at: int):
+    n = struct.unpack_from(">I", data, at + 12)[0]
+    for i in range(n):
+        start, end, glyph = struct.unpack_from(">III", data, at + 16 + 12 * i)
+        yield from range(start + (glyph == 0), end + 1)
+
+
+def read_cmap(path: str) -> Tuple[Tuple[int, int], ...]:
+    """Merged (first, last) codepoint ranges of `path`'s best Unicode cmap subtable."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    base = struct.unpack_from(">I", data, 12)[0] if data[:4] == b"ttcf" else 0   # first face of a collection
+    tables = {}
+    for i in range(struct.unpack_from(">H", data, base + 4)[0]):
+        tag, _, offset, _ = struct.unpack_from(">4sIII", data, base + 12 + 16 * i)
+        tables[tag] = offset
+    if b"cmap" not in tables:
+        return ()
+    cmap = tables[b"cmap"]
+    subtables = {}
+    for i in range(struct.unpack_from(">H", data, cmap + 2)[0]):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + 8 * i)
+        fmt = struct.unpack_from(">H", data, cmap + offset)[0]
+        subtables.setdefault((platform, encoding, fmt), cmap + offset)
+    key = next((k for k in _CMAP_PREFERENCE if k in subtables), None)
+    if key is None:
+        return ()
+    codepoints = (_format12 if key[2] == 12 else _format4)(data, subtables[key])
+    ranges = []
+    for cp in sorted(set(codepoints)):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return tuple((a, b) for a, b in ranges)
+
+
+@lru_cache(maxsize=None)
+def _coverage(path: str, stamp: Tuple[int, int]) -> FontCoverage:
+    return FontCoverage(path, read_cmap(path))
+
+
+def coverage(path: str) -> FontCoverage:
+    """Coverage index of a font file, built once per process (and again if the file changes)."""
+    st = os.stat(path)
+    return _coverage(path, (st.st_size, st.st_mtime_ns))
+
+
+@lru_cache(maxsize=None)
+def chain(names: Tuple[str, ...], font_dir: Optional[str]) -> Tuple[str, ...]:
+    """Font files to try, in order: the profile's font (first loadable of `names`), then FALLBACK.
+
+    The first entry is "" when the profile's font has no file (Pillow's built-in default).
+    """
+    primary = getattr(rebus_fonts.get_font(16, names, font_dir), "path", None)
+    primary = primary if isinstance(primary, str) else ""
+    paths = [primary]
+    for name in FALLBACK:
+        path = os.path.join(rebus_fonts.FONT_DIR, name)
+        if os.path.exists(path) and path not in paths:
+            paths.append(path)
+    return tuple(paths)
+
+
+class _Picker:
+    """Codepoint -> index of the first font in a chain that has it (None: neutral), memoised."""
+    __slots__ = ("covers", "memo")
+
+    def __init__(self, paths: Tuple[str, ...]):
+        self.covers = [coverage(p) if p else None for p in paths]
+        self.memo: Dict[str, Optional[int]] = {}
+
+    def __call__(self, ch: str) -> Optional[int]:
+        try:
+            return self.memo[ch]
+        except KeyError:
+            pass
+        if unicodedata.category(ch) in _NEUTRAL:
+            found = None
+        else:
+            cp = ord(ch)
+            found = next((i for i, cov in enumerate(self.covers) if cov is None or cp in cov), 0)
+        self.memo[ch] = found
+        return found
+
+
+_pickers: Dict[Tuple[str, ...], _Picker] = {}
+_pickers_lock = threading.Lock()
+
+
+def _picker(paths: Tuple[str, ...]) -> _Picker:
+    picker = _pickers.get(paths)
+    if picker is None:
+        with _pickers_lock:
+            picker = _pickers.setdefault(paths, _Picker(paths))
+    return picker
+
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segments(text: str, paths: Tuple[str, ...]) -> Tuple[Tuple[int, str], ...]:
+    """`text` as (index into `paths`, run) segments, each run drawable with one font."""
+    pick = _picker(paths)
+    out, start, current = [], 0, None
+    for i, ch in enumerate(text):
+        found = pick(ch)
+        if found is None or found == current:
+            continue
+        if current is not None:
+            out.append((current, text[start:i]))
+            start = i
+        current = found                                 # leading neutrals join the first segment
+    out.append((current or 0, text[start:]))
+    return tuple(out)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for name, fn in (("coverage", _coverage), ("segments", segments)):
+        info = fn.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+    return stats
+
+
+def clear_caches():
+    segments.cache_clear()
+    chain.cache_clear()
+    _coverage.cache_clear()
+    with _pickers_lock:
+        _pickers.clear()
@@ -0,0 +1,70 @@
+import os
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+from PIL import ImageFont
+
+import rebus_metrics
+
+# ------------------------------
+# Process-wide font + text metrics caches
+# ------------------------------
+# Streamlit re-executes the app script on every interaction, but imported
+# modules stay in sys.modules, so these caches live for the whole server
+# process and are shared by every session.
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+SYSTEM_FONTS = ("DejaVuSans.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+
+FONT_CACHE_SIZE = 128
+METRICS_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    with rebus_metrics.span("font"):             # misses only: hits never reach the body
+        return ImageFont.truetype(path, size=size)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _resolve_font(names: Tuple[str, ...], font_dir: Optional[str], size: int):
+    for name in names:
+        path = os.path.join(font_dir, name) if font_dir else name
+        try:
+            return load_font(path, size)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+
+def get_font(size: int, names: Sequence[str] = SYSTEM_FONTS, font_dir: Optional[str] = None):
+    """First loadable font of `names` at `size`; missing fonts are only probed once."""
+    return _resolve_font(tuple(names), font_dir, size)
+
+
+@lru_cache(maxsize=METRICS_CACHE_SIZE)
+def _text_bbox(path: str, size: int, text: str) -> Tuple[int, int, int, int]:
+    return load_font(path, size).getbbox(text)
+
+
+def text_bbox(font, text: str) -> Tuple[int, int, int, int]:
+    """Cached `font.getbbox(text)`, keyed by (font path, size, text)."""
+    path = getattr(font, "path", None)
+    if not isinstance(path, str):
+        return font.getbbox(text)
+    return _text_bbox(path, font.size, text)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    stats = {}
+    for name, fn in (("fonts", load_font), ("resolve", _resolve_font), ("metrics", _text_bbox)):
+        info = fn.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses,
+                       "size": info.currsize, "maxsize": info.maxsize}
+    return stats
+
+
+def clear_caches():
+    _text_bbox.cache_clear()
+    _resolve_font.cache_clear()
+    load_font.cache_clear()
@@ -0,0 +1,120 @@
+"""Bulk guess grading for live events.
+
+    python rebus_grade.py --pack tech guesses.csv --out graded.csv --totals totals.csv
+
+The input is a table with player, puzzle_id and guess columns, as .csv,
+.jsonl or .parquet. Every row gets a verdict (correct / close / wrong, with
+the same rules as the apps' Check button), and each player gets totals.
+
+Grading works on distinct values rather than rows. Guesses are normalised
+once per distinct string, exact answers are matched with one vectorised
+(puzzle_id, form) membership test, and only the distinct (puzzle_id, guess)
+pairs that miss go through the fuzzy grader.
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+import pandas as pd
+
+import rebus_answers
+import rebus_packs
+from rebus_answers import CLOSE, CORRECT, WRONG, AnswerIndex, Thresholds
+
+COLUMNS = ("player", "puzzle_id", "guess")
+VERDICTS = pd.CategoricalDtype([CORRECT, CLOSE, WRONG])
+
+
+def grade_frame(df: pd.DataFrame, index: AnswerIndex, t: Thresholds = rebus_answers.THRESHOLDS) -> pd.DataFrame:
+    """`df` plus a `verdict` column (categorical: correct / close / wrong)."""
+    missing = [c for c in COLUMNS[1:] if c not in df.columns]
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(missing)}")
+    puzzle = df["puzzle_id"].astype(str)
+    guess = df["guess"].fillna("").astype(str)
+
+    codes, uniques = pd.factorize(guess)
+    forms = pd.Index(map(rebus_answers.normalize, uniques)).take(codes)
+    answers = pd.MultiIndex.from_tuples(list(index.pairs()), names=["puzzle_id", "form"])
+    exact = pd.MultiIndex.from_arrays([puzzle, forms]).isin(answers)
+
+    verdict = pd.Series(WRONG, index=df.index, dtype=object)
+    verdict[exact] = CORRECT
+    rest = ~exact & (forms != "")
+    if rest.any():
+        misses = pd.DataFrame({"puzzle_id": puzzle[rest], "guess": guess[rest]})
+        distinct = misses.drop_duplicates()
+        graded = pd.Series([index.grade(g, p, t) for p, g in zip(distinct["puzzle_id"], distinct["guess"])],
+                           index=pd.MultiIndex.from_frame(distinct))
+        verdict[rest] = graded.reindex(pd.MultiIndex.from_frame(misses)).to_numpy()
+    return df.assign(verdict=verdict.astype(VERDICTS))
+
+
+def player_totals(graded: pd.DataFrame) -> pd.DataFrame:
+    """Per player: guesses, correct / close / wrong counts and puzzles solved, best first."""
+    counts = pd.crosstab(graded["player"], graded["verdict"]).reindex(columns=VERDICTS.categories, fill_value=0)
+    solved = graded[graded["verdict"] == CORRECT].groupby("player")["puzzle_id"].nunique()
+    totals = counts.assign(guesses=counts.sum(axis=1), solved=solved.reindex(counts.index, fill_value=0))
+    totals.columns = [str(c) for c in totals.columns]
+    return totals[["solved", "guesses", CORRECT, CLOSE, WRONG]].sort_values(["solved", "correct"], ascending=False)
+
+
+def read_table(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith((".jsonl", ".ndjson")):
+        return pd.read_json(path, lines=True, dtype=False)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def write_table(df: pd.DataFrame, path: str):
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    elif path.endswith((".jsonl", ".ndjson")):
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def open_named_pack(spec: str):
+    """A pack file path, or a built-in pack name (its data file if there is one, else the module's PUZZLES)."""
+    if os.path.exists(spec):
+        return rebus_packs.open_pack(spec)
+    try:
+        return rebus_packs.pack_for(spec)
+    except FileNotFoundError:
+        if spec not in rebus_packs.BUILTIN:
+            raise
+        return rebus_packs.ListPack(importlib.import_module(rebus_packs.BUILTIN[spec]).PUZZLES, spec)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Grade a table of (player, puzzle_id, guess) rows against a pack.")
+    ap.add_argument("guesses", help=".csv, .jsonl or .parquet with player, puzzle_id, guess columns")
+    ap.add_argument("--pack", required=True, help="built-in pack name (tech, company, hard) or pack file path")
+    ap.add_argument("--out", help="write graded rows here (same formats)")
+    ap.add_argument("--totals", help="write per-player totals here (default: print them)")
+    args = ap.parse_args(argv)
+
+    index = rebus_answers.index_for(open_named_pack(args.pack))
+    df = read_table(args.guesses)
+    t0 = time.perf_counter()
+    graded = grade_frame(df, index)
+    totals = player_totals(graded) if "player" in graded.columns else None
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"graded {len(graded)} guesses in {ms:.1f} ms: "
+          + ", ".join(f"{v} {n}" for v, n in graded["verdict"].value_counts(sort=False).items()), file=sys.stderr)
+
+    if args.out:
+        write_table(graded, args.out)
+    if totals is not None:
+        if args.totals:
+            write_table(totals.reset_index(), args.totals)
+        else:
+            print(totals.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Cold import cost of the rebus modules.
+
+    python rebus_imports.py
+    python rebus_imports.py tech_rebus_app rebus_pack_tech --runs 9
+
+Each module is imported in a fresh interpreter, --runs times, from the
+current directory. The median wall time of the import statement is reported,
+with the heavy third-party packages it pulled in. Run it from another
+checkout to compare trees.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+# the library surface: pack data and renderers, pack files, answer checking, scores
+LIBRARY = ("rebus_pack_tech", "rebus_pack_company", "rebus_pack_hard", "rebus_packs", "rebus_answers",
+           "rebus_scores", "rebus_metrics", "rebus_engine")
+APPS = ("tech_rebus_app", "rebus_company_pack", "rebus_hard_streamlit")
+HEAVY = ("streamlit", "pandas", "pyarrow", "numpy", "PIL", "emoji")
+
+_PROBE = ("import sys, time; t = time.perf_counter(); import {module}; "
+          "ms = (time.perf_counter() - t) * 1000; "
+          "print(ms, len(sys.modules), ' '.join(m for m in {heavy!r} if m in sys.modules))")
+
+
+def cold_import(module: str, runs: int = 5) -> Dict:
+    """Median import time of `module` in a fresh interpreter, and what it loaded."""
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                             capture_output=True, text=True)
+        if out.returncode:
+            return {"module": module, "error": out.stderr.strip().splitlines()[-1]}
+        ms, n, *heavy = out.stdout.split()
+        times.append(float(ms))
+    return {"module": module, "import_ms": round(statistics.median(times), 1), "modules": int(n),
+            "heavy": heavy}
+
+
+def bench(modules: Sequence[str], runs: int = 5) -> List[Dict]:
+    return [cold_import(m, runs) for m in modules]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cold import time of rebus modules (fresh interpreter each).")
+    ap.add_argument("modules", nargs="*", help="default: the library modules, then the apps")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+    for row in bench(args.modules or LIBRARY + APPS, args.runs):
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == "__main__":
+    main()
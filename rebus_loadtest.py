@@ -0,0 +1,192 @@
+"""Headless load test: many browser sessions against one app server.
+
+    python rebus_loadtest.py tech_rebus_app.py --sessions 300 --seconds 20
+    python rebus_loadtest.py tech_rebus_app.py --sessions 300 --seconds 20 --full-reruns
+    python rebus_loadtest.py tech_rebus_app.py --sessions 100 --click Hint
+
+Starts the app with `streamlit run` (headless) and opens N websocket sessions
+that speak the browser protocol. Each session requests the page once and
+then answers fragment auto-rerun requests the way the browser does, which is
+how the round timer ticks. With --full-reruns, each session instead reruns
+the whole script every second, like a naive sleep-and-rerun timer would.
+With --click LABEL, each session also clicks the button whose label contains
+LABEL once a second, scoped to the button's page region as the browser does.
+Server CPU (user + system, from /proc) is sampled over the measurement window
+and reported per second and per script run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as fh:
+        fields = fh.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _rerun(fragment_id: str = "", auto: bool = False, click: str = "") -> bytes:
+    msg = BackMsg()
+    msg.rerun_script.query_string = ""
+    msg.rerun_script.page_script_hash = ""
+    if fragment_id:
+        msg.rerun_script.fragment_id = fragment_id
+        msg.rerun_script.is_auto_rerun = auto
+    if click:
+        widget = msg.rerun_script.widget_states.widgets.add()
+        widget.id = click
+        widget.trigger_value = True
+    return msg.SerializeToString()
+
+
+class Session:
+    def __init__(self, url: str, full_reruns: bool, click: Optional[str] = None):
+        self.url = url
+        self.full_reruns = full_reruns
+        self.click = click
+        self.runs = 0
+        self.clicks = 0
+        self.errors = 0
+        self._button: Optional[Tuple[str, str]] = None   # (widget id, fragment id) of the button to click
+        self._tickers: Dict[str, asyncio.Task] = {}
+        self._ws = None
+
+    def close(self):
+        if self._ws is not None:
+            self._ws.close()                            # ends the read loop of an idle session
+
+    async def run(self, stop: asyncio.Event):
+        ws = self._ws = await websocket_connect(self.url, max_message_size=64 * 2**20)
+        await ws.write_message(_rerun(), binary=True)
+        if self.full_reruns:
+            self._tickers[""] = asyncio.ensure_future(self._tick(ws, "", 1.0, stop))
+        if self.click:
+            clicker = asyncio.ensure_future(self._clicks(ws, 1.0, stop))
+        while not stop.is_set():
+            data = await ws.read_message()
+            if data is None:
+                break
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "script_finished":
+                self.runs += 1
+            elif kind == "auto_rerun" and not self.full_reruns:
+                task = self._tickers.pop(msg.auto_rerun.fragment_id, None)
+                if task:
+                    task.cancel()
+                if msg.auto_rerun.interval > 0:
+                    self._tickers[msg.auto_rerun.fragment_id] = asyncio.ensure_future(
+                        self._tick(ws, msg.auto_rerun.fragment_id, msg.auto_rerun.interval, stop))
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "exception":
+                    self.errors += 1
+                elif self.click and element.WhichOneof("type") == "button" and self.click in element.button.label:
+                    self._button = (element.button.id, msg.delta.fragment_id)   # id changes with the label
+        for task in self._tickers.values():
+            task.cancel()
+        if self.click:
+            clicker.cancel()
+        ws.close()
+
+    async def _tick(self, ws, fragment_id: str, interval: float, stop: asyncio.Event):
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            await ws.write_message(_rerun(fragment_id, auto=bool(fragment_id)), binary=True)
+
+    async def _clicks(self, ws, interval: float, stop: asyncio.Event):
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            if self._button:
+                widget_id, fragment_id = self._button
+                await ws.write_message(_rerun(fragment_id, click=widget_id), binary=True)
+                self.clicks += 1
+
+
+async def _drive(url: str, pid: int, sessions: int, warmup: float, seconds: float, full_reruns: bool,
+                 click: Optional[str]) -> Dict:
+    stop = asyncio.Event()
+    clients = [Session(url, full_reruns, click) for _ in range(sessions)]
+    tasks = []
+    for c in clients:                                   # staggered, like people opening the page
+        tasks.append(asyncio.ensure_future(c.run(stop)))
+        await asyncio.sleep(0.01)
+    while any(c.runs == 0 for c in clients):           # first page loads are full runs; let them all land
+        await asyncio.sleep(0.1)
+    await asyncio.sleep(warmup)
+    runs0, clicks0, cpu0, t0 = sum(c.runs for c in clients), sum(c.clicks for c in clients), _cpu_seconds(pid), time.perf_counter()
+    await asyncio.sleep(seconds)
+    runs1, clicks1, cpu1, t1 = sum(c.runs for c in clients), sum(c.clicks for c in clients), _cpu_seconds(pid), time.perf_counter()
+    stop.set()
+    for c in clients:
+        c.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    runs, cpu, wall = runs1 - runs0, cpu1 - cpu0, t1 - t0
+    return {"sessions": sessions, "mode": "full reruns" if full_reruns else "fragment ticks",
+            "runs_per_s": round(runs / wall, 1), "clicks_per_s": round((clicks1 - clicks0) / wall, 1),
+            "server_cpu_pct": round(100 * cpu / wall, 1),
+            "cpu_ms_per_run": round(1000 * cpu / runs, 3) if runs else None,
+            "errors": sum(c.errors for c in clients)}
+
+
+def loadtest(app: str, sessions: int = 100, seconds: float = 20, warmup: float = 5,
+             full_reruns: bool = False, click: Optional[str] = None, env: Dict[str, str] = None) -> Dict:
+    port = _free_port()
+    cmd = [sys.executable, "-m", "streamlit", "run", app, "--server.headless", "true", "--server.port", str(port),
+           "--browser.gatherUsageStats", "false", "--server.fileWatcherType", "none",
+           "--server.enableXsrfProtection", "false"]
+    proc = subprocess.Popen(cmd, cwd=HERE, env={**os.environ, **(env or {})},
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(300):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        return asyncio.run(_drive(url, proc.pid, sessions, warmup, seconds, full_reruns, click))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:               # still draining a backlog of reruns
+            proc.kill()
+            proc.wait()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Server CPU of N open sessions of a rebus app.")
+    ap.add_argument("app", help="e.g. tech_rebus_app.py")
+    ap.add_argument("--sessions", type=int, nargs="+", default=[100])
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--warmup", type=float, default=5)
+    ap.add_argument("--full-reruns", action="store_true", help="rerun the whole script every second instead")
+    ap.add_argument("--click", metavar="LABEL", help="also click the button whose label contains LABEL every second")
+    args = ap.parse_args(argv)
+    for n in args.sessions:
+        print(json.dumps(loadtest(args.app, n, args.seconds, args.warmup, args.full_reruns, args.click)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
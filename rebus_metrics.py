@@ -0,0 +1,328 @@
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# ------------------------------
+# Render and rerun metrics
+# ------------------------------
+# Histograms of how long each part of a rerun takes, kept process-wide:
+#   rebus_stage_seconds{app, puzzle, stage}  rendering a puzzle image. The
+#       stages are font (loading a font file), emoji (rasterising an emoji
+#       into the sprite atlas), layout (compiling a layout), raster (drawing
+#       text and strokes), composite (pasting coverage masks and sprites,
+#       palette mapping), encode, image (a whole render-cache miss), svg
+#       (building the SVG instead, when REBUS_SVG is on) and prefetch (a
+#       background render of an upcoming puzzle, see rebus_prefetch).
+#   rebus_region_seconds{app, region}  building a page region's widgets
+#       (see rebus_regions), including the full script run as "page".
+# Labels come from context(): the apps set the app, and cached_image sets
+# the puzzle, so code deep in the renderer needs no extra arguments.
+# Puzzle labels are capped at MAX_PUZZLES distinct ids; later ones count
+# as "other".
+#
+# A sampled fraction of contexts (REBUS_TRACE_SAMPLE) is also traced: every
+# span inside it is kept, with its offset, as one structured record. The
+# last TRACE_KEEP records are kept in memory; with REBUS_TRACE_FILE set,
+# they are also appended there as JSON lines.
+#
+# Everything is exported in Prometheus text format, to REBUS_METRICS_FILE
+# (rewritten every REBUS_METRICS_INTERVAL_S, for a textfile collector) and/or
+# on http://127.0.0.1:$REBUS_METRICS_PORT/metrics. Nothing is exported
+# unless one of them is set.
+
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+MAX_PUZZLES = int(os.environ.get("REBUS_METRICS_MAX_PUZZLES", 500))
+
+TRACE_SAMPLE = float(os.environ.get("REBUS_TRACE_SAMPLE", 0.01))
+TRACE_FILE = os.environ.get("REBUS_TRACE_FILE", "")
+TRACE_KEEP = 200
+
+METRICS_FILE = os.environ.get("REBUS_METRICS_FILE", "")
+METRICS_PORT = int(os.environ.get("REBUS_METRICS_PORT", 0))
+METRICS_INTERVAL = float(os.environ.get("REBUS_METRICS_INTERVAL_S", 10))
+
+STAGE = "rebus_stage_seconds"
+REGION = "rebus_region_seconds"
+HELP = {STAGE: "Time per puzzle render stage.", REGION: "Time to build a page region (widgets and all)."}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-on-export bucket counts over BUCKETS_MS."""
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)      # last slot: above the top bucket
+        self.count = 0
+        self.sum = 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimate (ms) by linear interpolation inside the bucket, as Prometheus does."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                if i == len(BUCKETS_MS):
+                    return BUCKETS_MS[-1]
+                lo = BUCKETS_MS[i - 1] if i else 0.0
+                return lo + (BUCKETS_MS[i] - lo) * (rank - seen) / n
+            seen += n
+        return BUCKETS_MS[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._series: Dict[Tuple[str, Labels], Histogram] = {}
+        self._puzzles = set()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, ms: float, labels: Labels):
+        i = bisect_left(BUCKETS_MS, ms)
+        with self._lock:
+            h = self._series.get((name, labels))
+            if h is None:
+                h = self._series[(name, labels)] = Histogram()
+            h.counts[i] += 1
+            h.count += 1
+            h.sum += ms
+
+    def puzzle_label(self, puzzle: str) -> str:
+        if puzzle in self._puzzles:
+            return puzzle
+        with self._lock:
+            if len(self._puzzles) >= MAX_PUZZLES:
+                return "other"
+            self._puzzles.add(puzzle)
+        return puzzle
+
+    def series(self) -> List[Tuple[str, Dict[str, str], Histogram]]:
+        """Snapshot: (metric, labels, histogram copy) for every series."""
+        out = []
+        with self._lock:
+            for (name, labels), h in self._series.items():
+                c = Histogram()
+                c.counts, c.count, c.sum = list(h.counts), h.count, h.sum
+                out.append((name, dict(labels), c))
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+            self._puzzles.clear()
+
+
+REGISTRY = Registry()
+TRACES: "deque[Dict]" = deque(maxlen=TRACE_KEEP)
+_trace_lock = threading.Lock()
+_local = threading.local()
+
+
+# ------------------------------
+# Recording
+# ------------------------------
+@contextmanager
+def context(**labels: str):
+    """Labels (app, puzzle) for everything recorded inside; may start a sampled trace."""
+    parent_labels = getattr(_local, "labels", {})
+    parent_trace = getattr(_local, "trace", None)
+    _local.labels = {**parent_labels, **labels}
+    trace = parent_trace
+    if trace is None and TRACE_SAMPLE > 0 and random.random() < TRACE_SAMPLE:
+        trace = _local.trace = {"ts": round(time.time(), 3), **_local.labels, "spans": [],
+                                "_t0": time.perf_counter()}
+    try:
+        yield
+    finally:
+        _local.labels = parent_labels
+        if trace is not None and parent_trace is None:
+            _local.trace = None
+            _finish(trace)
+
+
+def _label(name: str) -> str:
+    return getattr(_local, "labels", {}).get(name, "")
+
+
+def _trace_span(name: str, ms: float, t0: Optional[float]):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        at = (t0 if t0 is not None else time.perf_counter() - ms / 1000) - trace["_t0"]
+        trace["spans"].append({"name": name, "ms": round(ms, 3), "at_ms": round(at * 1000, 3)})
+
+
+def _finish(trace: Dict):
+    trace["ms"] = round((time.perf_counter() - trace.pop("_t0")) * 1000, 3)
+    TRACES.append(trace)
+    if TRACE_FILE:
+        line = json.dumps(trace, ensure_ascii=False) + "\n"
+        with _trace_lock, open(TRACE_FILE, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+def record_stage(stage: str, ms: float, t0: Optional[float] = None):
+    labels = (("app", _label("app")), ("puzzle", REGISTRY.puzzle_label(_label("puzzle"))), ("stage", stage))
+    REGISTRY.observe(STAGE, ms, labels)
+    _trace_span(stage, ms, t0)
+
+
+def record_region(region: str, ms: float, t0: Optional[float] = None):
+    REGISTRY.observe(REGION, ms, (("app", _label("app")), ("region", region)))
+    _trace_span(f"region:{region}", ms, t0)
+
+
+@contextmanager
+def span(stage: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, (time.perf_counter() - t0) * 1000, t0)
+
+
+# ------------------------------
+# Reading
+# ------------------------------
+def summary(name: str, by: Tuple[str, ...], **where: str) -> List[Dict]:
+    """Series of `name` matching `where`, merged over labels not in `by`: count, mean, p50, p95 (ms), slowest first."""
+    merged: Dict[Tuple[str, ...], Histogram] = {}
+    for metric, labels, h in REGISTRY.series():
+        if metric != name or any(labels.get(k) != v for k, v in where.items()):
+            continue
+        key = tuple(labels.get(k, "") for k in by)
+        m = merged.setdefault(key, Histogram())
+        m.counts = [a + b for a, b in zip(m.counts, h.counts)]
+        m.count += h.count
+        m.sum += h.sum
+    rows = [{**dict(zip(by, key)), "count": h.count, "mean_ms": round(h.sum / h.count, 3),
+             "p50_ms": round(h.quantile(0.5), 3), "p95_ms": round(h.quantile(0.95), 3)}
+            for key, h in merged.items() if h.count]
+    return sorted(rows, key=lambda r: -r["mean_ms"])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(labels: Dict[str, str]) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def _cache_lines() -> List[str]:
+    # only for modules the process already uses; exporting never imports the renderer
+    lines = []
+    cache = sys.modules.get("rebus_cache")
+    if cache is not None:
+        stats = cache.RENDER_CACHE.stats()
+        lines += ["# TYPE rebus_render_cache_hits_total counter", f"rebus_render_cache_hits_total {stats['hits']}",
+                  "# TYPE rebus_render_cache_misses_total counter", f"rebus_render_cache_misses_total {stats['misses']}",
+                  "# TYPE rebus_render_cache_bytes gauge", f"rebus_render_cache_bytes {stats['bytes']}"]
+    prefetch = sys.modules.get("rebus_prefetch")
+    if prefetch is not None:
+        stats = prefetch.PREFETCHER.stats()
+        lines += ["# TYPE rebus_prefetch_depth gauge",
+                  f'rebus_prefetch_depth{{direction="ahead"}} {stats["ahead"]}',
+                  f'rebus_prefetch_depth{{direction="behind"}} {stats["behind"]}',
+                  "# TYPE rebus_prefetch_queued gauge", f"rebus_prefetch_queued {stats['queued']}",
+                  "# TYPE rebus_prefetch_views_total counter", f"rebus_prefetch_views_total {stats['views']}",
+                  "# TYPE rebus_prefetch_view_hits_total counter", f"rebus_prefetch_view_hits_total {stats['hits']}",
+                  "# TYPE rebus_prefetch_rendered_total counter", f"rebus_prefetch_rendered_total {stats['rendered']}"]
+    fonts = sys.modules.get("rebus_fonts")
+    if fonts is not None:
+        lines.append("# TYPE rebus_font_cache_misses_total counter")
+        lines += [f'rebus_font_cache_misses_total{{cache="{k}"}} {v["misses"]}' for k, v in fonts.cache_stats().items()]
+        fallback = sys.modules.get("rebus_fallback")
+        if fallback is not None:
+            lines += [f'rebus_font_cache_misses_total{{cache="fallback_{k}"}} {v["misses"]}'
+                      for k, v in fallback.cache_stats().items()]
+    return lines
+
+
+def prometheus_text() -> str:
+    lines, typed = [], set()
+    for name, labels, h in sorted(REGISTRY.series(), key=lambda s: (s[0], sorted(s[1].items()))):
+        if name not in typed:
+            typed.add(name)
+            lines += [f"# HELP {name} {HELP.get(name, '')}", f"# TYPE {name} histogram"]
+        base, cum = _fmt(labels), 0
+        for le, n in zip(BUCKETS_MS, h.counts):
+            cum += n
+            lines.append(f'{name}_bucket{{{base},le="{le / 1000:g}"}} {cum}')
+        lines.append(f'{name}_bucket{{{base},le="+Inf"}} {h.count}')
+        lines.append(f"{name}_sum{{{base}}} {h.sum / 1000:.6f}")
+        lines.append(f"{name}_count{{{base}}} {h.count}")
+    return "\n".join(lines + _cache_lines()) + "\n"
+
+
+# ------------------------------
+# Export
+# ------------------------------
+def write_metrics(path: str = METRICS_FILE):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(prometheus_text())
+    os.replace(tmp, path)                             # scrapers never see a half-written file
+
+
+def serve(port: int = METRICS_PORT, host: str = "127.0.0.1"):
+    """Serve /metrics on host:port from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer   # ~25 ms; only when serving
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="rebus-metrics-http", daemon=True).start()
+    return server
+
+
+def _write_loop(path: str, interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            write_metrics(path)
+        except OSError:
+            pass
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_exporters():
+    """Start the configured exporters once per process (the app script reruns on every click)."""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    if METRICS_FILE:
+        threading.Thread(target=_write_loop, args=(METRICS_FILE, METRICS_INTERVAL),
+                         name="rebus-metrics-file", daemon=True).start()
+        atexit.register(write_metrics, METRICS_FILE)
+    if METRICS_PORT:
+        try:
+            serve(METRICS_PORT)
+        except OSError:                               # another server process already has the port
+            pass
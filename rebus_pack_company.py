@@ -0,0 +1,206 @@
+"""Company pack: the built-in puzzles of the Renda rebus app and their renderer (headless)."""
+from typing import Dict, List
+
+
+def draw_puzzle(layout: List[Dict], w: int = 1100, h: int = 650, bg="#0b1220", fg="#e7edf7", scale: float = 1.0):
+    import rebus_engine
+    return rebus_engine.draw_layout(layout, rebus_engine.COMPANY, w=w, h=h, bg=bg, fg=fg, scale=scale)
+
+
+PUZZLES = [
+    {"id":"food_for_thought","answer":"Food for Thought","hint":"Groceries + thinking bubbles.","layout":[
+        {"text":"FOOD", "xy":[360,250], "size":100},
+        {"text":"🤔 🤔 🤔 🤔", "xy":[740,250], "size":88},
+        {"text":"for", "xy":[550,350], "size":64, "underline":True}
+    ]},
+    {"id":"brainstorming","answer":"Brainstorming","hint":"Many THINKS.","layout":[
+        {"text":"THINK", "xy":[520,220], "size":86},
+        {"text":"THINK", "xy":[520,300], "size":86},
+        {"text":"THINK", "xy":[520,380], "size":86}
+    ]},
+    {"id":"user_research","answer":"User Research","hint":"Lots of USERS.","layout":[
+        {"text":"USER USER USER USER", "xy":[550,300], "size":72}
+    ]},
+    {"id":"roadmap","answer":"Roadmap","hint":"Road over map.","layout":[
+        {"text":"ROAD", "xy":[550,250], "size":92},
+        {"text":"────", "xy":[550,300], "size":72},
+        {"text":"MAP", "xy":[550,360], "size":92}
+    ]},
+    {"id":"wireframe","answer":"Wireframe","hint":"Wire around a frame.","layout":[
+        {"text":"FRAME", "xy":[550,300], "size":96, "box":{"pad":24}},
+        {"text":"wire wire", "xy":[550,180], "size":48, "dashed":True}
+    ]},
+    {"id":"feedback_loop","answer":"Feedback Loop","hint":"Comments circling","layout":[
+        {"text":"💬  →  💬  →  💬  →  💬", "xy":[550,300], "size":64}
+    ]},
+    {"id":"prototype","answer":"Prototype","hint":"First version build.","layout":[
+        {"text":"PROTO", "xy":[450,280], "size":96},
+        {"text":"type", "xy":[700,320], "size":72}
+    ]},
+    {"id":"persona","answer":"Persona","hint":"User archetype.","layout":[
+        {"text":"USER → 👤", "xy":[550,300], "size":72}
+    ]},
+    {"id":"usability","answer":"Usability","hint":"Use + ability.","layout":[
+        {"text":"USE + ABILITY", "xy":[550,300], "size":80}
+    ]},
+    {"id":"design_thinking","answer":"Design Thinking","hint":"Design + brain.","layout":[
+        {"text":"🎨 + 🧠", "xy":[550,300], "size":100}
+    ]},
+    {"id":"coffee_break","answer":"Coffee Break","hint":"☕ + split line.","layout":[
+        {"text":"☕", "xy":[450,300], "size":120},
+        {"text":"— — —", "xy":[650,300], "size":80}
+    ]},
+    {"id":"deadline","answer":"Deadline","hint":"Line at time.","layout":[
+        {"text":"🕒", "xy":[500,260], "size":110},
+        {"text":"────", "xy":[600,320], "size":64}
+    ]},
+    {"id":"stand_up","answer":"Stand-Up","hint":"Standing ↑.","layout":[
+        {"text":"stand", "xy":[520,260], "size":96},
+        {"text":"↑", "xy":[520,340], "size":96}
+    ]},
+    {"id":"meeting_overload","answer":"Meeting Overload","hint":"Too many calendars.","layout":[
+        {"text":"📅 📅 📅 📅 📅", "xy":[550,300], "size":72}
+    ]},
+    {"id":"team_spirit","answer":"Team Spirit","hint":"People + trophy.","layout":[
+        {"text":"👩‍💻👨‍🎨👨‍💻👩‍💼  +  🏆", "xy":[550,300], "size":70}
+    ]},
+    {"id":"remote_work","answer":"Remote Work","hint":"House + laptop.","layout":[
+        {"text":"🏠  +  💻", "xy":[550,300], "size":100}
+    ]},
+    {"id":"multitasking","answer":"Multitasking","hint":"Doing many at once.","layout":[
+        {"text":"task  task  task  task", "xy":[550,280], "size":60},
+        {"text":"all at once", "xy":[550,340], "size":56}
+    ]},
+    {"id":"work_life_balance","answer":"Work-Life Balance","hint":"Work ↔ Life.","layout":[
+        {"text":"💼  ↔  🏡", "xy":[550,300], "size":120}
+    ]},
+    {"id":"big_picture","answer":"Big Picture","hint":"PICTURE made BIG.","layout":[
+        {"text":"PICTURE", "xy":[550,300], "size":128}
+    ]},
+    {"id":"keep_it_simple","answer":"Keep It Simple","hint":"SIMPLE underlined.","layout":[
+        {"text":"SIMPLE", "xy":[550,300], "size":210, "underline":True}
+    ]},
+    {"id":"sleep_on_it","answer":"Sleep on It","hint":"Bed on the word IT.","layout":[
+        {"text":"🛏", "xy":[480,280], "size":110},
+        {"text":"IT", "xy":[650,320], "size":110}
+    ]},
+    {"id":"time_is_money","answer":"Time is Money","hint":"Clock + money.","layout":[
+        {"text":"🕒 = 💰", "xy":[550,300], "size":120}
+    ]},
+    {"id":"outside_the_box","answer":"Think Outside the Box","hint":"Brain outside a box.","layout":[
+        {"text":"[  BOX  ]      🧠", "xy":[550,300], "size":72}
+    ]},
+    {"id":"two_heads","answer":"Two Heads are Better than One","hint":"Two heads > one.","layout":[
+        {"text":"🙂🙂  >  🙂", "xy":[550,300], "size":110}
+    ]},
+    {"id":"trial_and_error","answer":"Trial and Error","hint":"Try → fail → learn.","layout":[
+        {"text":"TRY → ❌ → LEARN → ✅", "xy":[550,300], "size":64}
+    ]},
+    {"id":"leap_of_faith","answer":"Leap of Faith","hint":"Jump + cross gap.","layout":[
+        {"text":"🏃‍♂️  ⟶   ⛰  ⛰", "xy":[550,300], "size":88}
+    ]},
+    {"id":"walk_the_talk","answer":"Walk the Talk","hint":"Footprints + speech bubble.","layout":[
+        {"text":"👣  +  💬", "xy":[550,300], "size":110}
+    ]},
+    {"id":"lock_and_key","answer":"Lock and Key","hint":"🔒 + 🔑.","layout":[
+        {"text":"🔒  +  🔑", "xy":[550,300], "size":120}
+    ]},
+    {"id":"mixed_emotions","answer":"Mixed Emotions","hint":"Multiple faces.","layout":[
+        {"text":"😃 😐 😢 😡", "xy":[550,300], "size":96}
+    ]},
+    {"id":"look_closer","answer":"Look Closer","hint":"Magnifier toward text.","layout":[
+        {"text":"LOOK  🔍", "xy":[550,300], "size":100}
+    ]},
+    {"id":"talk_of_the_town","answer":"Talk of the Town","hint":"Many chat bubbles over skyline.","layout":[
+        {"text":"🏙  +  💬💬💬", "xy":[550,300], "size":88}
+    ]},
+    {"id":"silver_lining","answer":"Silver Lining","hint":"Cloud with a bright edge.","layout":[
+        {"text":"☁︎  ✨", "xy":[550,300], "size":120}
+    ]},
+    {"id":"light_bulb_moment","answer":"Light-Bulb Moment","hint":"Idea popped.","layout":[
+        {"text":"💡  !", "xy":[550,300], "size":120}
+    ]},
+    {"id":"hit_the_ground_running","answer":"Hit the Ground Running","hint":"Start fast.","layout":[
+        {"text":"START  →  🏃‍♀️💨", "xy":[550,300], "size":80}
+    ]},
+    {"id":"under_the_weather","answer":"Under the Weather","hint":"Umbrella below clouds.","layout":[
+        {"text":"☁ ☁ ☁", "xy":[550,240], "size":86},
+        {"text":"☂", "xy":[550,340], "size":120}
+    ]},
+    {"id":"on_the_same_page","answer":"On the Same Page","hint":"Two people, one page.","layout":[
+        {"text":"👥  📄", "xy":[550,300], "size":110}
+    ]},
+    {"id":"icebreaker","answer":"Icebreaker","hint":"Breaking ice.","layout":[
+        {"text":"❄️  ———  ❄️", "xy":[550,280], "size":90},
+        {"text":"🚢", "xy":[550,360], "size":90}
+    ]},
+    {"id":"green_light","answer":"Green Light","hint":"Traffic signal on go.","layout":[
+        {"text":"🟢", "xy":[550,300], "size":128}
+    ]},
+    {"id":"red_flag","answer":"Red Flag","hint":"Beware sign.","layout":[
+        {"text":"🚩", "xy":[550,300], "size":128}
+    ]},
+    {"id":"user_journey","answer":"User Journey","hint":"Path with user.","layout":[
+        {"text":"👤  ——→  📱", "xy":[550,300], "size":84}
+    ]},
+    {"id":"ab_testing","answer":"A/B Testing","hint":"A vs B.","layout":[
+        {"text":"A    vs    B", "xy":[550,300], "size":110}
+    ]},
+    {"id":"customer_first","answer":"Customer First","hint":"Customer before others.","layout":[
+        {"text":"CUSTOMER        FIRST", "xy":[550,300], "size":84}
+    ]},
+    {"id":"user_feedback","answer":"User Feedback","hint":"User with speech bubble.","layout":[
+        {"text":"👤  💬", "xy":[550,300], "size":120}
+    ]},
+    {"id":"launch_day","answer":"Launch Day","hint":"Rocket + calendar.","layout":[
+        {"text":"🚀  +  📅", "xy":[550,300], "size":110}
+    ]},
+    {"id":"backlog","answer":"Backlog","hint":"Tasks stacked.","layout":[
+        {"text":"📋\\n📋\\n📋", "xy":[550,300], "size":80}
+    ]},
+    {"id":"priority_queue","answer":"Priority Queue","hint":"Important item first.","layout":[
+        {"text":"⭐  →  item → item → item", "xy":[550,300], "size":72}
+    ]},
+    {"id":"quick_win","answer":"Quick Win","hint":"Fast + trophy.","layout":[
+        {"text":"⚡  +  🏆", "xy":[550,300], "size":110}
+    ]},
+    {"id":"north_star","answer":"North Star","hint":"Compass + star.","layout":[
+        {"text":"🧭  ⭐", "xy":[550,300], "size":110}
+    ]},
+    {"id":"growth_mindset","answer":"Growth Mindset","hint":"Brain with up arrow.","layout":[
+        {"text":"🧠  📈", "xy":[550,300], "size":110}
+    ]},
+    {"id":"butterflies_in_stomach","answer":"Butterflies in My Stomach","hint":"Nervous excitement.","layout":[
+        {"text":"🦋🦋🦋", "xy":[550,240], "size":80},
+        {"text":"🙂", "xy":[550,360], "size":100}
+    ]},
+    {"id":"piece_of_cake","answer":"Piece of Cake","hint":"Easy task.","layout":[
+        {"text":"🍰", "xy":[550,300], "size":128}
+    ]},
+    {"id":"spill_the_beans","answer":"Spill the Beans","hint":"Reveal a secret.","layout":[
+        {"text":"🫘🫘🫘  ⟶", "xy":[550,300], "size":96}
+    ]},
+    {"id":"break_the_ice","answer":"Break the Ice","hint":"Crack snowflake.","layout":[
+        {"text":"❄️  💥", "xy":[550,300], "size":120}
+    ]},
+    {"id":"hit_the_books","answer":"Hit the Books","hint":"Study hard.","layout":[
+        {"text":"📚  💥", "xy":[550,300], "size":110}
+    ]},
+    {"id":"under_pressure","answer":"Under Pressure","hint":"Weight squeezing.","layout":[
+        {"text":"⬇️  TEXT  ⬇️", "xy":[550,300], "size":96}
+    ]},
+    {"id":"on_fire","answer":"On Fire","hint":"Hot streak.","layout":[
+        {"text":"🔥", "xy":[550,300], "size":140}
+    ]},
+    {"id":"cold_feet","answer":"Cold Feet","hint":"Nervous to proceed.","layout":[
+        {"text":"🦶🦶  ❄️", "xy":[550,300], "size":110}
+    ]},
+    {"id":"break_even","answer":"Break Even","hint":"Split equals sign.","layout":[
+        {"text":"=   (break)", "xy":[550,300], "size":96}
+    ]},
+    {"id":"turn_the_tables","answer":"Turn the Tables","hint":"Flip the layout.","layout":[
+        {"text":"TABLE", "xy":[550,300], "size":110, "rotate":180}
+    ]},
+]
+
+assert len(PUZZLES) >= 50
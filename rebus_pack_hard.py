@@ -0,0 +1,224 @@
+"""Hard pack: the built-in hard puzzles and their renderer (headless)."""
+from typing import Any, Dict, List
+
+
+def draw_canvas(layout: List[Dict[str, Any]], w: int = 1100, h: int = 650, bg="#0b1220", fg="#e7edf7", scale: float = 1.0):
+    import rebus_engine
+    return rebus_engine.draw_layout(layout, rebus_engine.HARD, w=w, h=h, bg=bg, fg=fg, scale=scale)
+
+
+PUZZLES = [
+    {"id":"mind_over_matter","answer":"Mind Over Matter","hint":"One word over another.","layout":[
+        {"text":"MIND","xy":[550,240],"size":110},
+        {"text":"MATTER","xy":[550,400],"size":110,"color":"#94a3b8"}
+    ]},
+    {"id":"reading_between_lines","answer":"Reading Between the Lines","hint":"Look carefully at the lines.","layout":[
+        {"shape":"line","xyxy":[220,220,880,220],"width":4,"color":"#94a3b8"},
+        {"text":"READING","xy":[550,320],"size":108},
+        {"shape":"line","xyxy":[220,420,880,420],"width":4,"color":"#94a3b8"}
+    ]},
+    {"id":"back_to_square_one","answer":"Back to Square One","hint":"Return to the starting point.","layout":[
+        {"text":"◀ back","xy":[340,180],"size":54,"color":"#94a3b8","align":"left"},
+        {"text":"ONE","xy":[550,330],"size":120},
+        {"shape":"box","xyxy":[470,280,630,400],"width":5}
+    ]},
+    {"id":"head_over_heels","answer":"Head Over Heels","hint":"Orientation matters.","layout":[
+        {"text":"HEAD","xy":[550,240],"size":110},
+        {"text":"HEELS","xy":[550,430],"size":110,"rotate":180}
+    ]},
+    {"id":"once_in_a_blue_moon","answer":"Once in a Blue Moon","hint":"A color + a rarity.","layout":[
+        {"text":"ONCE","xy":[360,280],"size":86,"color":"#94a3b8"},
+        {"text":"MOON","xy":[560,330],"size":128},
+        {"text":"BLUE","xy":[760,380],"size":86,"color":"#94a3b8"}
+    ]},
+    {"id":"time_flies","answer":"Time Flies","hint":"Up and away.","layout":[
+        {"text":"TIME","xy":[500,320],"size":130},
+        {"text":"↗ ↗ ↗","xy":[700,240],"size":80,"color":"#94a3b8"}
+    ]},
+    {"id":"man_overboard","answer":"Man Overboard","hint":"Over + thing you stand on.","layout":[
+        {"text":"MAN","xy":[550,260],"size":110},
+        {"text":"BOARD","xy":[550,420],"size":110}
+    ]},
+    {"id":"down_to_earth","answer":"Down to Earth","hint":"Follow the arrow.","layout":[
+        {"text":"DOWN","xy":[550,240],"size":110},
+        {"text":"↓","xy":[550,310],"size":90,"color":"#94a3b8"},
+        {"text":"EARTH","xy":[550,400],"size":110}
+    ]},
+    {"id":"touchdown","answer":"Touchdown","hint":"Sports finish line vibe.","layout":[
+        {"text":"TOUCH","xy":[550,260],"size":120},
+        {"text":"↓","xy":[550,360],"size":110,"color":"#94a3b8"}
+    ]},
+    {"id":"small_talk","answer":"Small Talk","hint":"Check the scale.","layout":[
+        {"text":"talk","xy":[550,330],"size":56}
+    ]},
+    {"id":"split_decision","answer":"Split Decision","hint":"It's divided.","layout":[
+        {"text":"DECI|SION","xy":[550,330],"size":120}
+    ]},
+    {"id":"missing_you","answer":"Missing You","hint":"There's a gap.","layout":[
+        {"text":"YO _","xy":[550,330],"size":140}
+    ]},
+    {"id":"undercover","answer":"Undercover","hint":"Someone is hiding.","layout":[
+        {"text":"COVER","xy":[550,280],"size":120},
+        {"text":"me","xy":[550,420],"size":88,"color":"#94a3b8"}
+    ]},
+    {"id":"turn_back_time","answer":"Turn Back Time","hint":"Reverse it.","layout":[
+        {"text":"TIME","xy":[550,330],"size":120,"rotate":180},
+        {"text":"BACK ◀","xy":[380,260],"size":72,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"uphill_battle","answer":"Uphill Battle","hint":"A struggle on a slope.","layout":[
+        {"text":"BATTLE","xy":[700,420],"size":110},
+        {"shape":"line","xyxy":[280,480,820,240],"width":6,"color":"#94a3b8","dashed":True}
+    ]},
+    {"id":"long_story_short","answer":"Long Story Short","hint":"Length is the clue.","layout":[
+        {"text":"STOOOOORY","xy":[550,300],"size":110},
+        {"text":"short","xy":[740,400],"size":64,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"elephant_in_room","answer":"The Elephant in the Room","hint":"Something obvious but ignored.","layout":[
+        {"shape":"box","xyxy":[400,260,800,480],"width":4},
+        {"text":"elephant","xy":[600,370],"size":64,"color":"#94a3b8"}
+    ]},
+    {"id":"cut_corners","answer":"Cut Corners","hint":"The shape isn't complete.","layout":[
+        {"shape":"line","xyxy":[320,260,780,260],"width":5},
+        {"shape":"line","xyxy":[320,520,780,520],"width":5},
+        {"shape":"line","xyxy":[320,260,320,330],"width":5},
+        {"shape":"line","xyxy":[780,260,780,330],"width":5},
+        {"shape":"line","xyxy":[320,450,320,520],"width":5},
+        {"shape":"line","xyxy":[780,450,780,520],"width":5}
+    ]},
+    {"id":"out_of_order","answer":"Out of Order","hint":"Scrambled.","layout":[
+        {"text":"ou","xy":[150,330],"size":130},
+        {"text":"t","xy":[550,530],"size":130},
+        {"text":"OD RE R","xy":[550,330],"size":130},
+        {"text":"out","xy":[700,460],"size":56,"color":"#94a3b8","align":"left"},
+        {"text":"o u t","xy":[700,60],"size":56,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"edge_case","answer":"Edge Case","hint":"Look to the margin.","layout":[
+        {"text":"CASE","xy":[1060,340],"size":120,"align":"right"}
+    ]},
+    {"id":"rising_costs","answer":"Rising Costs","hint":"Climb.","layout":[
+        {"text":"c o s t s","xy":[550,480],"size":90},
+        {"text":"COSTS","xy":[550,360],"size":100},
+        {"text":"COSTS","xy":[550,260],"size":110}
+    ]},
+    {"id":"on_the_fence","answer":"On the Fence","hint":"Perched.","layout":[
+        {"text":"Sitting","xy":[550,260],"size":110},
+        {"text":"--------","xy":[550,260],"size":110},
+        {"text":"||||| FENCE |||||","xy":[550,380],"size":86}
+    ]},
+    {"id":"bottleneck","answer":"Bottleneck","hint":"A tight spot.","layout":[
+        {"text":"BOTTLE","xy":[550,280],"size":120},
+        {"text":"NECK","xy":[550,420],"size":88,"color":"#94a3b8"}
+    ]},
+    {"id":"penny_for_your_thoughts","answer":"Penny for Your Thoughts","hint":"Symbolic currency.","layout":[
+        {"text":"¢   →   THOUGHTS","xy":[550,330],"size":112}
+    ]},
+    {"id":"food_for_thought_hard","answer":"Food for Thought","hint":"Letters, spacing, and a small word.","layout":[
+        {"text":"F  O  O  D","xy":[430,260],"size":110,"align":"left"},
+        # {"text":"for","xy":[550,330],"size":60,"color":"#94a3b8"},
+        {"text":"TH( )UGHT","xy":[650,410],"size":100,"align":"right"}
+    ]},
+    {"id":"underestimate","answer":"Underestimate","hint":"Below the mark.","layout":[
+        {"shape":"line","xyxy":[260,300,840,300],"width":5},
+        {"text":"ESTIMATE","xy":[550,400],"size":120}
+    ]},
+    {"id":"connection_lost","answer":"Connection Lost","hint":"Mind the gap.","layout":[
+        {"text":"CONNECT   — — —   ION","xy":[550,330],"size":100}
+    ]},
+    # {"id":"couch_potato","answer":"Couch Potato","hint":"One on another.","layout":[
+    #     {"text":"COUCH","xy":[550,280],"size":120,"color":"#94a3b8"},
+    #     {"text":"POTATO","xy":[550,420],"size":120}
+    # ]},
+    {"id":"hold_on","answer":"Hold On","hint":"Grip.","layout":[
+        {"text":"[HOLD]   ON","xy":[550,330],"size":120}
+    ]},
+    {"id":"brain_freeze","answer":"Brain Freeze","hint":"Chilly upstairs.","layout":[
+        {"text":"B  R  A  I  N","xy":[550,280],"size":110},
+        {"text":"* * * * *","xy":[550,350],"size":70,"color":"#94a3b8"},
+        {"text":"COLD","xy":[550,430],"size":110}
+    ]},
+    {"id":"thinking_cap","answer":"Thinking Cap","hint":"Headwear helps.","layout":[
+        {"text":"CAP","xy":[550,260],"size":100},
+        {"text":"THINKING","xy":[550,400],"size":110},
+        {"shape":"line","xyxy":[390,360,710,360],"width":6,"color":"#94a3b8"}
+    ]},
+    {"id":"go_back_square_one","answer":"Go Back to Square One","hint":"Return to 1.","layout":[
+        {"text":"GO  ◀","xy":[370,230],"size":66,"color":"#94a3b8","align":"left"},
+        {"text":"1","xy":[550,335],"size":140},
+        {"shape":"box","xyxy":[510,295,590,375],"width":5}
+    ]},
+    {"id":"silence_is_golden","answer":"Silence is Golden","hint":"Chemical hint.","layout":[
+        {"text":"SILENCE","xy":[550,300],"size":110,"color":"#94a3b8"},
+        {"text":"Au","xy":[550,400],"size":110}
+    ]},
+    {"id":"lost_in_translation","answer":"Lost in Translation","hint":"One word disappears.","layout":[
+        {"text":"TRANSLATION","xy":[550,320],"size":120},
+        {"text":"lost","xy":[420,360],"size":54,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"no_idea","answer":"No Idea","hint":"A null of sorts.","layout":[
+        {"text":"∅","xy":[470,300],"size":120,"color":"#94a3b8"},
+        {"text":"IDEA","xy":[650,320],"size":120,"align":"left"}
+    ]},
+    {"id":"space_invader","answer":"Space Invader","hint":"Plenty of gaps.","layout":[
+        # {"text":"S    P    A    C    E","xy":[550,300],"size":96},
+        {"text":"I  N  V  A  D  E  R","xy":[550,400],"size":110}
+    ]},
+    {"id":"upper_hand","answer":"Upper Hand","hint":"Position matters.","layout":[
+        {"text":"HAND","xy":[550,220],"size":110},
+        {"text":"(upper)","xy":[550,300],"size":64,"color":"#94a3b8"}
+    ]},
+    {"id":"mind_blown","answer":"Mind Blown","hint":"Kaboom.","layout":[
+        {"text":"MIND","xy":[500,300],"size":120},
+        {"text":"BOOM!","xy":[700,380],"size":100,"color":"#94a3b8"}
+    ]},
+    {"id":"breakthrough","answer":"Breakthrough","hint":"Going past an obstacle.","layout":[
+        {"text":"WALL","xy":[430,320],"size":110},
+        {"text":"BREAK →","xy":[690,330],"size":100,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"under_the_radar","answer":"Under the Radar","hint":"Stay unseen.","layout":[
+        {"text":"RADAR","xy":[550,280],"size":120},
+        {"shape":"line","xyxy":[350,340,750,340],"width":5},
+        {"text":"me","xy":[550,400],"size":90,"color":"#94a3b8"}
+    ]},
+    {"id":"piece_of_cake","answer":"Piece of Cake","hint":"Slice it.","layout":[
+        {"text":"[  CAKE  ]","xy":[550,320],"size":110},
+        {"text":"piece →","xy":[380,360],"size":64,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"break_even","answer":"Break Even","hint":"Equality interrupted.","layout":[
+        {"text":"==","xy":[550,320],"size":140},
+        {"text":"(break)","xy":[710,320],"size":64,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"cold_feet","answer":"Cold Feet","hint":"Temperature + toes.","layout":[
+        {"text":"C O L D","xy":[550,250],"size":100,"color":"#94a3b8"},
+        {"text":"FEET","xy":[550,400],"size":120}
+    ]},
+    {"id":"outnumbered","answer":"Outnumbered","hint":"Overwhelmed by digits.","layout":[
+        {"text":"1 2 3 4 5 6 7 8 9 10","xy":[550,300],"size":80},
+        {"text":"me","xy":[550,400],"size":80,"color":"#94a3b8"}
+    ]},
+    {"id":"the_last_straw","answer":"The Last Straw","hint":"Final one.","layout":[
+        {"text":"STRAW STRAW STRAW STRAW","xy":[550,300],"size":70},
+        {"text":"→ last","xy":[780,340],"size":60,"color":"#94a3b8","align":"left"}
+    ]},
+    {"id":"corner_case","answer":"Corner Case","hint":"Top-left detail.","layout":[
+        {"text":"CASE","xy":[700,420],"size":110},
+        {"shape":"line","xyxy":[220,240,220,300],"width":8,"color":"#94a3b8"},
+        {"shape":"line","xyxy":[220,240,280,240],"width":8,"color":"#94a3b8"}
+    ]},
+    {"id":"crossroads","answer":"Crossroads","hint":"Intersection.","layout":[
+        {"shape":"line","xyxy":[550,240,550,500],"width":8},
+        {"shape":"line","xyxy":[430,370,670,370],"width":8},
+        {"text":"ROAD","xy":[550,170],"size":90}
+    ]},
+    {"id":"burnout","answer":"Burnout","hint":"Two-part word.","layout":[
+        {"text":"BURN","xy":[520,300],"size":120},
+        {"text":"OUT","xy":[700,360],"size":110,"color":"#94a3b8"}
+    ]},
+    {"id":"underline","answer":"Underline","hint":"Placement matters.","layout":[
+        {"text":"LINE","xy":[550,280],"size":120},
+        {"text":"UNDER","xy":[550,400],"size":110,"color":"#94a3b8"}
+    ]},
+    {"id":"leftovers","answer":"Leftovers","hint":"Two sides.","layout":[
+        {"text":"-->","xy":[200,330],"size":120,"align":"left"},
+        {"text":"OVER","xy":[900,330],"size":120,"align":"right"}
+    ]},
+]
@@ -0,0 +1,241 @@
+"""Puzzle packs stored as data files, loaded metadata-first.
+
+A pack is `<name>.pack.jsonl`, one puzzle per line:
+
+    {"id": "...", "answer": "...", "hint": "...", "layout": [...]}
+
+Next to it, `<name>.pack.idx.json` holds id/answer/hint plus the byte offset
+of every line. It is rebuilt automatically when the .jsonl changes, so adding
+a puzzle means appending a line. At startup only the index is read; layouts
+are read and parsed on demand and kept in a bounded LRU cache.
+
+A binary `<name>.rbp` (see rebus_binpack) in the same directory takes
+precedence over the .jsonl: it opens in constant time and memory.
+
+    python rebus_packs.py export --out packs tech company hard
+    python rebus_packs.py index packs/tech.pack.jsonl
+"""
+import argparse
+import importlib
+import json
+import os
+import threading
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional
+
+PACK_DIR = os.environ.get("REBUS_PACK_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs"))
+LAYOUT_CACHE_SIZE = int(os.environ.get("REBUS_LAYOUT_CACHE", 512))
+INDEX_VERSION = 2
+
+# built-in pack name -> headless module holding its PUZZLES literal (no Streamlit import)
+BUILTIN = {"tech": "rebus_pack_tech", "company": "rebus_pack_company", "hard": "rebus_pack_hard"}
+
+META_FIELDS = ("id", "answer", "hint")
+
+
+class ListPack:
+    """In-memory pack over a PUZZLES list (the built-in packs)."""
+
+    def __init__(self, puzzles: List[Dict], name: str = ""):
+        self.name = name
+        self._puzzles = puzzles
+
+    def __len__(self) -> int:
+        return len(self._puzzles)
+
+    @property
+    def version(self) -> tuple:
+        """Changes when the wrapped list is replaced or grows; wrappers of one list share it."""
+        return (id(self._puzzles), len(self._puzzles))
+
+    def __getitem__(self, i: int) -> Dict:
+        return self._puzzles[i]
+
+    def meta(self, i: int) -> Dict:
+        p = self._puzzles[i]
+        return {k: p[k] for k in META_FIELDS}
+
+    def layout(self, i: int) -> List[Dict]:
+        return self._puzzles[i]["layout"]
+
+    def metas(self) -> Iterator[Dict]:
+        return (self.meta(i) for i in range(len(self._puzzles)))
+
+    def stats(self) -> Dict[str, int]:
+        n = len(self._puzzles)
+        return {"puzzles": n, "layouts_loaded": n}
+
+
+class FilePack:
+    """Pack backed by a .pack.jsonl file: index in memory, layouts on demand."""
+
+    def __init__(self, path: str, cache_size: int = LAYOUT_CACHE_SIZE):
+        self.path = path
+        self.name = os.path.basename(path).split(".")[0]
+        idx = load_index(path)
+        self._ids, self._answers, self._hints = idx["ids"], idx["answers"], idx["hints"]
+        self._offsets = array("q", idx["offsets"])
+        self._lengths = array("l", idx["lengths"])
+        self._fh = open(path, "rb")
+        self._lock = threading.Lock()
+        self._load = lru_cache(maxsize=cache_size)(self._read)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self._load(i)
+
+    def meta(self, i: int) -> Dict:
+        return {"id": self._ids[i], "answer": self._answers[i], "hint": self._hints[i]}
+
+    def layout(self, i: int) -> List[Dict]:
+        return self._load(i)["layout"]
+
+    def metas(self) -> Iterator[Dict]:
+        for i, a, h in zip(self._ids, self._answers, self._hints):
+            yield {"id": i, "answer": a, "hint": h}
+
+    def _read(self, i: int) -> Dict:
+        with self._lock:
+            self._fh.seek(self._offsets[i])
+            line = self._fh.read(self._lengths[i])
+        return json.loads(line)
+
+    def stats(self) -> Dict[str, int]:
+        info = self._load.cache_info()
+        return {"puzzles": len(self._ids), "layouts_loaded": info.currsize, "hits": info.hits,
+                "misses": info.misses, "maxsize": info.maxsize}
+
+    def close(self):
+        self._fh.close()
+
+
+def index_path(path: str) -> str:
+    return path[: -len(".jsonl")] + ".idx.json" if path.endswith(".jsonl") else path + ".idx.json"
+
+
+def build_index(path: str) -> Dict:
+    # columnar, so loading it builds five flat lists rather than one small list per puzzle
+    idx = {"ids": [], "answers": [], "hints": [], "offsets": [], "lengths": []}
+    offset = 0
+    with open(path, "rb") as fh:
+        for line in fh:
+            if line.strip():
+                rec = json.loads(line)
+                idx["ids"].append(rec["id"])
+                idx["answers"].append(rec["answer"])
+                idx["hints"].append(rec.get("hint", ""))
+                idx["offsets"].append(offset)
+                idx["lengths"].append(len(line))
+            offset += len(line)
+    st = os.stat(path)
+    return {"version": INDEX_VERSION, "source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns, **idx}
+
+
+def load_index(path: str) -> Dict:
+    """Index entries for `path`, rebuilding (and rewriting) the index if it is missing or stale."""
+    idx_path = index_path(path)
+    st = os.stat(path)
+    try:
+        with open(idx_path, encoding="utf-8") as fh:
+            idx = json.load(fh)
+        if (idx.get("version") == INDEX_VERSION and idx["source_size"] == st.st_size
+                and idx["source_mtime_ns"] == st.st_mtime_ns):
+            return idx
+    except (OSError, ValueError, KeyError):
+        pass
+    idx = build_index(path)
+    try:
+        tmp = f"{idx_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(idx, fh, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, idx_path)
+    except OSError:
+        pass                        # read-only pack dir: keep the in-memory index
+    return idx
+
+
+def write_pack(puzzles: Iterable[Dict], path: str) -> int:
+    n = 0
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for p in puzzles:
+            rec = {"id": p["id"], "answer": p["answer"], "hint": p.get("hint", ""), "layout": p["layout"]}
+            fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+            n += 1
+    os.replace(tmp, path)
+    load_index(path)
+    return n
+
+
+def pack_path(name: str, pack_dir: str = PACK_DIR) -> str:
+    return os.path.join(pack_dir, f"{name}.pack.jsonl")
+
+
+def binpack_path(name: str, pack_dir: str = PACK_DIR) -> str:
+    return os.path.join(pack_dir, f"{name}.rbp")
+
+
+_open: Dict[str, tuple] = {}
+_open_lock = threading.Lock()
+
+
+def open_pack(path: str):
+    """Process-wide pack for `path` (the app script reruns on every click); reopened if the file changed.
+
+    .rbp files open as rebus_binpack.BinPack, anything else as FilePack.
+    """
+    st = os.stat(path)
+    stamp = (st.st_size, st.st_mtime_ns)
+    with _open_lock:
+        cached = _open.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        if path.endswith(".rbp"):
+            import rebus_binpack
+            pack = rebus_binpack.BinPack(path)
+        else:
+            pack = FilePack(path)
+        _open[path] = (stamp, pack)
+    # a replaced pack is not closed here: sessions mid-rerun may still hold it, and it
+    # releases its file (or map) when the last of them drops it
+    return pack
+
+
+def pack_for(name: str, builtin: Optional[List[Dict]] = None, pack_dir: str = PACK_DIR):
+    """The pack file `name` in `pack_dir` (.rbp, then .pack.jsonl) if there is one, else the built-in list."""
+    for path in (binpack_path(name, pack_dir), pack_path(name, pack_dir)):
+        if os.path.exists(path):
+            return open_pack(path)
+    if builtin is None:
+        raise FileNotFoundError(pack_path(name, pack_dir))
+    return ListPack(builtin, name)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export built-in packs to data files / rebuild pack indexes.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export", help="write built-in PUZZLES lists as .pack.jsonl files")
+    ex.add_argument("packs", nargs="*", metavar="PACK", help=f"any of {', '.join(sorted(BUILTIN))} (default: all)")
+    ex.add_argument("--out", default=PACK_DIR)
+    ix = sub.add_parser("index", help="(re)build the index of .pack.jsonl files")
+    ix.add_argument("paths", nargs="+")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        unknown = [name for name in args.packs if name not in BUILTIN]
+        if unknown:
+            ap.error(f"unknown pack {', '.join(unknown)} (choose from {', '.join(sorted(BUILTIN))})")
+        os.makedirs(args.out, exist_ok=True)
+        for name in args.packs or sorted(BUILTIN):
+            n = write_pack(importlib.import_module(BUILTIN[name]).PUZZLES, pack_path(name, args.out))
+            print(f"{name}: {n} puzzles -> {pack_path(name, args.out)}")
+    else:
+        for path in args.paths:
+            print(f"{path}: {len(load_index(path)['ids'])} puzzles")
+
+
+if __name__ == "__main__":
+    main()
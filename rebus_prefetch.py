@@ -0,0 +1,141 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Sequence, Tuple, Union
+
+import rebus_metrics
+import rebus_static
+from rebus_cache import RENDER_CACHE, RenderCache, cached_image, image_key
+
+# ------------------------------
+# Background prefetch of upcoming puzzles
+# ------------------------------
+# The puzzle region renders on a render-cache miss, inside the rerun that the
+# host's "Next" click started, so the room waited for render + encode. The
+# session's puzzle order is known in advance, so show() now serves the
+# current puzzle and queues its neighbours in that order: the next AHEAD and
+# the previous BEHIND. A daemon worker renders and encodes them into
+# RENDER_CACHE while the current puzzle is on screen, so navigating is a
+# cache hit.
+#
+# The queue is newest-first. A click re-queues the puzzles around where the
+# host is now ahead of older requests, and entries already cached are
+# skipped. Past MAX_QUEUED the oldest requests are dropped. Prefetch renders
+# are timed as the "prefetch" stage. With url=True, show() returns the
+# image's rebus_static URL instead of its bytes, and the worker publishes
+# prefetched images too. stats() (the debug panel and the Prometheus export)
+# reports the depth, the queue, and how many shown puzzles were already
+# cached (the hit rate).
+
+AHEAD = int(os.environ.get("REBUS_PREFETCH_AHEAD", 3))
+BEHIND = int(os.environ.get("REBUS_PREFETCH_BEHIND", 1))
+MAX_QUEUED = 64
+
+
+class Prefetcher:
+    """Shows puzzles from RENDER_CACHE and renders their neighbours ahead of time on a daemon thread."""
+
+    def __init__(self, ahead: int = AHEAD, behind: int = BEHIND, cache: RenderCache = RENDER_CACHE):
+        self.ahead = ahead
+        self.behind = behind
+        self.cache = cache
+        self.views = 0
+        self.hits = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: "OrderedDict[str, Tuple[Any, ...]]" = OrderedDict()   # newest (most wanted) last
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._worker = None
+
+    def show(self, pack: Sequence[Dict], order: Sequence[int], idx: int, draw_fn: Callable, renderer: str,
+             scale: float = 1.0, url: bool = False) -> Union[bytes, str]:
+        """Image of puzzle `order[idx]` (bytes, or its static URL with `url`); its neighbours are then prefetched."""
+        puz = pack[order[idx]]
+        key = image_key(puz["layout"], renderer, scale=scale)
+        hit = key in self.cache
+        data = cached_image(draw_fn, puz["layout"], renderer, label=puz["id"], scale=scale, cache=self.cache)
+        with self._lock:
+            self.views += 1
+            self.hits += hit
+        # +1 first, then -1, +2, +3, ...
+        steps = sorted([*range(1, self.ahead + 1), *range(-1, -self.behind - 1, -1)], key=lambda s: (abs(s), s < 0))
+        wanted = dict.fromkeys((idx + s) % len(order) for s in steps)
+        wanted.pop(idx, None)
+        self.schedule([pack[order[i]] for i in wanted], draw_fn, renderer, scale, url)
+        return rebus_static.publish(key, data) if url else data
+
+    def schedule(self, puzzles: Sequence[Dict], draw_fn: Callable, renderer: str, scale: float = 1.0,
+                 url: bool = False):
+        """Queue `puzzles` (most wanted first) for rendering into the cache, ahead of anything queued before."""
+        jobs = []
+        for puz in puzzles:
+            key = image_key(puz["layout"], renderer, scale=scale)
+            if self._needed(key, url):
+                jobs.append((key, (draw_fn, puz["layout"], renderer, puz["id"], scale, url)))
+        if not jobs:
+            return
+        with self._lock:
+            for key, job in reversed(jobs):
+                self._queue.pop(key, None)
+                self._queue[key] = job
+            while len(self._queue) > MAX_QUEUED:
+                self._queue.popitem(last=False)
+                self.dropped += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="rebus-prefetch", daemon=True)
+                self._worker.start()
+            self._idle.clear()
+            self._wake.set()
+
+    def _needed(self, key: str, url: bool) -> bool:
+        return key not in self.cache or (url and not rebus_static.is_published(key))
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._queue:
+                    self._wake.clear()
+                    self._idle.set()
+                    continue
+                key, (draw_fn, layout, renderer, label, scale, url) = self._queue.popitem()
+            if not self._needed(key, url):              # shown since it was queued
+                with self._lock:
+                    self.skipped += 1
+                continue
+            try:
+                with rebus_metrics.context(app=renderer, puzzle=label), rebus_metrics.span("prefetch"):
+                    data = cached_image(draw_fn, layout, renderer, label=label, scale=scale, cache=self.cache)
+                    if url:
+                        rebus_static.publish(key, data)
+            except Exception:                           # the foreground render of this puzzle reports it
+                with self._lock:
+                    self.failed += 1
+                continue
+            with self._lock:
+                self.rendered += 1
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Block until the queue is empty and nothing is rendering; False on timeout."""
+        return self._idle.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"ahead": self.ahead, "behind": self.behind, "queued": len(self._queue), "views": self.views,
+                    "hits": self.hits, "hit_rate": round(self.hits / self.views, 3) if self.views else None,
+                    "rendered": self.rendered, "skipped": self.skipped, "dropped": self.dropped,
+                    "failed": self.failed}
+
+
+PREFETCHER = Prefetcher()
+
+
+def show(pack: Sequence[Dict], order: Sequence[int], idx: int, draw_fn: Callable, renderer: str,
+         scale: float = 1.0, url: bool = False) -> Union[bytes, str]:
+    """PREFETCHER.show(): the current puzzle's image, with its neighbours rendered in the background."""
+    return PREFETCHER.show(pack, order, idx, draw_fn, renderer, scale, url)
@@ -0,0 +1,75 @@
+import functools
+import os
+from typing import Callable, Optional
+
+import streamlit as st
+
+import rebus_metrics
+import rebus_prefetch
+import rebus_runs
+
+# ------------------------------
+# Page regions
+# ------------------------------
+# Streamlit reruns the whole script on every widget interaction, so typing a
+# guess or toggling the hint used to redraw the puzzle image too. The apps
+# now build the page from regions (puzzle view, hint/answer panel, guess box,
+# scoreboard). Each region is an st.fragment, so a widget inside a region
+# reruns only that region. A region that changes the current puzzle (Skip)
+# asks for a full rerun with st.rerun().
+#
+# Every run of a region is timed under its name in rebus_runs, and so is the
+# full script run (the "page" region). The run counts show which regions an
+# action touched, and the times show what it cost. Times are labelled with
+# the app, which page() keeps in session state because a fragment rerun does
+# not go through page().
+#
+# With ?debug=1 in the URL (or REBUS_DEBUG=1), page() appends a debug panel
+# with the process's region and render-stage timings and the latest sampled
+# traces (see rebus_metrics).
+
+APP_KEY = "rebus_app"
+
+
+def region(name: str, run_every: Optional[float] = None) -> Callable:
+    """Decorator: run `fn` as an independently rerunnable page region, timed as `name`."""
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def timed_fn(*args, **kwargs):
+            with rebus_metrics.context(app=st.session_state.get(APP_KEY, "")), rebus_runs.timed(name):
+                return fn(*args, **kwargs)
+        return st.fragment(timed_fn, run_every=run_every)
+    return wrap
+
+
+def debug_enabled() -> bool:
+    return bool(os.environ.get("REBUS_DEBUG")) or st.query_params.get("debug") == "1"
+
+
+def page(main: Callable[[], None], app: str = ""):
+    """Run the app script's `main`, timed as the "page" region of `app`."""
+    st.session_state[APP_KEY] = app
+    rebus_metrics.start_exporters()
+    with rebus_metrics.context(app=app), rebus_runs.timed("page"):
+        main()
+    if debug_enabled():
+        debug_panel()
+
+
+@region("debug")
+def debug_panel():
+    with st.expander("⏱ Performance (this server process, all sessions)", expanded=True):
+        st.button("Refresh", key="debug_refresh")
+        st.caption("Page regions: widget building per rerun")
+        st.dataframe(rebus_metrics.summary(rebus_metrics.REGION, ("app", "region")), hide_index=True)
+        st.caption("Render stages (render-cache misses only)")
+        st.dataframe(rebus_metrics.summary(rebus_metrics.STAGE, ("stage",)), hide_index=True)
+        st.caption("Slowest puzzles: whole image render + encode")
+        st.dataframe(rebus_metrics.summary(rebus_metrics.STAGE, ("app", "puzzle"), stage="image")[:10],
+                     hide_index=True)
+        st.caption("Prefetch: neighbours rendered ahead; hit rate = shown puzzles already cached")
+        st.dataframe([rebus_prefetch.PREFETCHER.stats()], hide_index=True)
+        traces = list(rebus_metrics.TRACES)[-5:]
+        if traces:
+            st.caption(f"Latest sampled traces (1 in {1 / rebus_metrics.TRACE_SAMPLE:.0f})")
+            st.json(traces[::-1], expanded=False)
@@ -0,0 +1,60 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+import rebus_metrics
+
+# ------------------------------
+# Rerun timing
+# ------------------------------
+# Wall and CPU time of each rerun of a page region (the timer fragment, ...),
+# process-wide, so the cost of a tick can be read off a live server.
+# CPU time is the script thread's own (time.thread_time), so other sessions
+# running at the same moment don't inflate it. Wall times also go into the
+# rebus_region_seconds histogram (see rebus_metrics).
+
+
+class RunLog:
+    """Per-region run count and wall / CPU totals."""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, region: str, wall_ms: float, cpu_ms: float):
+        with self._lock:
+            tot = self._totals.setdefault(region, {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "last_ms": 0.0})
+            tot["count"] += 1
+            tot["wall_ms"] += wall_ms
+            tot["cpu_ms"] += cpu_ms
+            tot["last_ms"] = wall_ms
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {region: {"count": t["count"], "wall_ms": round(t["wall_ms"], 3), "cpu_ms": round(t["cpu_ms"], 3),
+                             "avg_wall_ms": round(t["wall_ms"] / t["count"], 3),
+                             "avg_cpu_ms": round(t["cpu_ms"] / t["count"], 3), "last_ms": round(t["last_ms"], 3)}
+                    for region, t in self._totals.items()}
+
+    def clear(self):
+        with self._lock:
+            self._totals.clear()
+
+
+RUN_LOG = RunLog()
+
+
+@contextmanager
+def timed(region: str, log: RunLog = RUN_LOG):
+    t0, c0 = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall_ms = (time.perf_counter() - t0) * 1000
+        log.record(region, wall_ms, (time.thread_time() - c0) * 1000)
+        rebus_metrics.record_region(region, wall_ms, t0)
+
+
+def run_stats() -> Dict[str, Dict[str, float]]:
+    return RUN_LOG.stats()
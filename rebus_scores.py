@@ -0,0 +1,196 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ------------------------------
+# Persistent team scoreboard
+# ------------------------------
+# Scores live in SQLite (WAL mode) keyed by (event, team), so they survive
+# browser refreshes and server restarts. Every session and every server
+# process sees the same board, so the host laptop and the projector can both
+# show it.
+#
+# Writes are write-behind. add() only bumps an in-memory delta and returns.
+# A writer thread coalesces the deltas and applies them as one upsert
+# transaction every FLUSH_INTERVAL seconds, so a click never waits on disk.
+# Reads return the committed rows plus any deltas not yet written, so a
+# session sees its own click on the very next rerun. Upserts add deltas
+# rather than overwrite totals, so concurrent processes never lose points.
+# Each batch also records its sequence number in the same transaction, which
+# is how a read knows whether the batch in flight is already in its snapshot.
+# Neither reads nor add() ever wait for a write to finish.
+#
+# After a crash the board is exactly the last committed batch; at most one
+# interval of clicks is lost. Pending deltas are flushed at exit.
+
+DB_PATH = os.environ.get("REBUS_SCORE_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "scores.db"))
+FLUSH_INTERVAL = float(os.environ.get("REBUS_SCORE_FLUSH_S", 0.25))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    event   TEXT NOT NULL,
+    team    TEXT NOT NULL,
+    points  INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL,
+    PRIMARY KEY (event, team)
+);
+CREATE INDEX IF NOT EXISTS scores_leaderboard ON scores (event, points DESC);
+CREATE TABLE IF NOT EXISTS writers (
+    writer  TEXT PRIMARY KEY,
+    seq     INTEGER NOT NULL
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")       # WAL + NORMAL: atomic batches, may lose the last one on power loss
+    return conn
+
+
+class Scoreboard:
+    """Team points per event, persisted in SQLite with batched background writes."""
+
+    def __init__(self, path: str = DB_PATH, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batches = 0
+        self.writes = 0
+        self._id = f"{os.getpid()}:{id(self):x}:{time.time_ns()}"
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._inflight: Dict[Tuple[str, str], int] = {}
+        self._seq = 0                              # last batch number handed to the writer
+        self._lock = threading.Lock()              # guards the dicts above; never held during I/O
+        self._flush_lock = threading.Lock()        # one batch at a time
+        self._read_lock = threading.Lock()
+        self._read = _connect(path)
+        self._read.executescript(SCHEMA)
+        self._write = _connect(path)
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="rebus-scores", daemon=True)
+        self._writer.start()
+
+    # ---- writes (never block on disk) ----
+
+    def add(self, event: str, team: str, delta: int = 1):
+        with self._lock:
+            key = (event, team)
+            self._pending[key] = self._pending.get(key, 0) + delta
+        self._wake.set()
+
+    def add_teams(self, event: str, teams: Iterable[str]):
+        """Make sure `teams` are on the board (at their current score, or 0)."""
+        for team in teams:
+            self.add(event, team, 0)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            if self._closed:
+                break
+            time.sleep(self.flush_interval)            # let a burst of clicks coalesce into one transaction
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Write pending points as one transaction; False if the database stayed locked (points are kept)."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return True
+                self._inflight, self._pending = self._pending, {}
+                self._seq += 1
+                seq = self._seq
+            now = time.time()
+            rows = [(event, team, delta, now) for (event, team), delta in self._inflight.items()]
+            try:
+                with self._write:
+                    self._write.execute("BEGIN IMMEDIATE")
+                    self._write.executemany(
+                        "INSERT INTO scores (event, team, points, updated) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (event, team) DO UPDATE "
+                        "SET points = points + excluded.points, updated = excluded.updated", rows)
+                    self._write.execute("INSERT OR REPLACE INTO writers (writer, seq) VALUES (?, ?)", (self._id, seq))
+            except sqlite3.OperationalError:           # another process held the write lock past the timeout
+                with self._lock:
+                    for key, delta in self._inflight.items():
+                        self._pending[key] = self._pending.get(key, 0) + delta
+                    self._inflight = {}
+                self._wake.set()
+                return False
+            with self._lock:
+                self._inflight = {}
+            self.batches += 1
+            self.writes += len(rows)
+            return True
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        self._read.close()
+        self._write.close()
+
+    # ---- reads ----
+
+    def leaderboard(self, event: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(team, points) for `event`, highest first, including points not yet written."""
+        with self._lock:
+            inflight = [(k[1], d) for k, d in self._inflight.items() if k[0] == event]
+            pending = [(k[1], d) for k, d in self._pending.items() if k[0] == event]
+            seq = self._seq
+        with self._read_lock:
+            self._read.execute("BEGIN")                # one snapshot for both queries
+            try:
+                rows = self._read.execute("SELECT team, points FROM scores WHERE event = ? "
+                                          "ORDER BY points DESC, team", (event,)).fetchall()
+                done = self._read.execute("SELECT seq FROM writers WHERE writer = ?", (self._id,)).fetchone()
+            finally:
+                self._read.execute("COMMIT")
+        done = done[0] if done else 0
+        # batch `seq` holds what was in flight; anything pending goes into a later batch
+        extra = (inflight if done < seq else []) + (pending if done <= seq else [])
+        if extra:
+            totals = dict(rows)
+            for team, delta in extra:
+                totals[team] = totals.get(team, 0) + delta
+            rows = sorted(totals.items(), key=lambda r: (-r[1], r[0]))
+        return rows[:limit] if limit else rows
+
+    def scores(self, event: str) -> Dict[str, int]:
+        return dict(self.leaderboard(event))
+
+    def reset(self, event: str):
+        """Remove every team of `event`, including points not yet written."""
+        with self._flush_lock:
+            with self._lock:
+                for key in [k for k in self._pending if k[0] == event]:
+                    del self._pending[key]
+            with self._write:
+                self._write.execute("BEGIN IMMEDIATE")
+                self._write.execute("DELETE FROM scores WHERE event = ?", (event,))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = len(self._pending) + len(self._inflight)
+        return {"batches": self.batches, "rows_written": self.writes, "pending": pending}
+
+
+_boards: Dict[str, Scoreboard] = {}
+_boards_lock = threading.Lock()
+
+
+def scoreboard(path: str = DB_PATH) -> Scoreboard:
+    """Process-wide Scoreboard for `path` (the app script reruns on every click)."""
+    with _boards_lock:
+        board = _boards.get(path)
+        if board is None:
+            board = _boards[path] = Scoreboard(path)
+            atexit.register(board.close)
+    return board
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+# ------------------------------
+# Puzzle images by stable URL
+# ------------------------------
+# st.image(bytes) sends the encoded image through Streamlit on every rerun
+# that draws it, for every session, and the browser gets a fresh media URL
+# each time, so it can never cache one. With one projector and 150 phones on
+# the same puzzle, the server sent that image 151 times per puzzle.
+#
+# Now publish() writes each cached image once into static/puzzles/, named by
+# the hash of its bytes. The page references it with an <img> tag. Streamlit
+# serves static/ (server.enableStaticServing) with tornado's static handler,
+# which marks a request carrying ?v= as cacheable for ten years, and the
+# name changes whenever the bytes do. A repeated view costs the server a
+# dict lookup and the browser a cache hit, across reruns, reloads and
+# sessions. Files are written atomically, so a concurrent request never
+# sees half an image. The directory is pruned oldest-first to
+# REBUS_STATIC_MB on the first publish and again each time another
+# PRUNE_EVERY of the budget has been written. A memoised URL whose file
+# has gone (pruned, or the directory wiped) is written again.
+#
+# REBUS_STATIC=0, or static serving switched off, sends bytes as before.
+
+ENABLED = os.environ.get("REBUS_STATIC", "1") != "0"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "puzzles")
+URL_PREFIX = "app/static/puzzles/"
+BUDGET_MB = float(os.environ.get("REBUS_STATIC_MB", 256))
+PRUNE_EVERY = 0.125                             # of the budget written since the last prune
+
+_MAGIC = ((b"\x89PNG", "png"), (b"\xff\xd8", "jpg"), (b"RIFF", "webp"))
+
+_published: Dict[str, Tuple[str, str]] = {}    # render-cache key -> (file, URL)
+_lock = threading.Lock()
+_since_prune = float("inf")                     # bytes written since the last prune; none yet
+
+
+def enabled() -> bool:
+    """True when puzzle images should be served by URL: REBUS_STATIC is on and Streamlit serves static/."""
+    if not ENABLED:
+        return False
+    import streamlit as st
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def _ext(data: bytes) -> str:
+    return next((ext for magic, ext in _MAGIC if data.startswith(magic)), "png")
+
+
+def prune(max_bytes: Optional[float] = None):
+    """Delete the oldest published images until static/puzzles/ fits in `max_bytes` (default: the budget)."""
+    if max_bytes is None:
+        max_bytes = BUDGET_MB * 2**20
+    try:
+        entries = [e for e in os.scandir(STATIC_DIR) if e.is_file()]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    for e in entries:
+        if total <= max_bytes:
+            break
+        total -= e.stat().st_size
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
+
+def is_published(key: str) -> bool:
+    entry = _published.get(key)
+    return entry is not None and os.path.exists(entry[0])
+
+
+def publish(key: str, data: bytes) -> str:
+    """Stable, long-cacheable URL of `data` (the render-cache entry `key`); written to disk once."""
+    entry = _published.get(key)
+    if entry is not None and os.path.exists(entry[0]):
+        return entry[1]
+    global _since_prune
+    with _lock:
+        due = _since_prune >= BUDGET_MB * 2**20 * PRUNE_EVERY
+        if due:
+            _since_prune = 0
+    if due:
+        prune()
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    name = f"{digest}.{_ext(data)}"
+    path = os.path.join(STATIC_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(STATIC_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+        with _lock:
+            _since_prune += len(data)
+    url = f"{URL_PREFIX}{name}?v={digest[:12]}"
+    _published[key] = (path, url)
+    return url
+
+
+def image(img: Union[str, bytes], alt: str = "Puzzle"):
+    """st.image for a puzzle: a published URL as an <img> tag, anything else (bytes, SVG) as before."""
+    import streamlit as st
+    if isinstance(img, str) and img.startswith(URL_PREFIX):
+        st.markdown(f'<img src="{img}" alt="{alt}" style="width:100%;height:auto">', unsafe_allow_html=True)
+    else:
+        st.image(img, width="stretch")
@@ -0,0 +1,176 @@
+import base64
+import os
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+import rebus_engine
+import rebus_metrics
+from rebus_cache import RENDER_CACHE, RenderCache, layout_key
+from rebus_engine import Profile, place_text
+
+# ------------------------------
+# SVG backend
+# ------------------------------
+# Emits the same layout format as SVG text instead of rasterising it. Text is
+# placed with the raster engine's own metrics (place_text), so positions, boxes
+# and underlines line up with the PNG output; textLength pins each run to the
+# measured advance in case the browser substitutes a font. Fonts are referenced
+# by family name (the profile font, then any fallback fonts the text uses), or
+# embedded once per font file with embed_fonts=True.
+#
+# Anything the backend cannot express raises Unsupported; cached_svg() turns
+# that into None so callers fall back to the raster path.
+
+ENABLED = os.environ.get("REBUS_SVG", "") == "1"
+
+
+class Unsupported(ValueError):
+    pass
+
+
+def _n(v) -> str:
+    return str(int(v)) if float(v).is_integer() else f"{v:.2f}".rstrip("0")
+
+
+def _attrs(**kw) -> str:
+    return "".join(f" {k.rstrip('_').replace('_', '-')}={quoteattr(_n(v) if isinstance(v, (int, float)) else str(v))}"
+                   for k, v in kw.items() if v is not None)
+
+
+def _dash(it: Dict, default) -> Dict:
+    if not it.get("dashed", False):
+        return {}
+    return {"stroke_dasharray": " ".join(_n(d) for d in it.get("dash", default)),
+            "stroke_dashoffset": it.get("dash_offset") or None}
+
+
+def _rect(x1, y1, x2, y2, radius, stroke, width, fill=None, **extra) -> str:
+    # PIL strokes inward from the (inclusive) box edge; SVG strokes centre on it
+    inset = width / 2 if stroke else 0
+    return "<rect" + _attrs(x=x1 + inset, y=y1 + inset, width=x2 - x1 + 1 - 2 * inset,
+                            height=y2 - y1 + 1 - 2 * inset, rx=radius or None, fill=fill or "none",
+                            stroke=stroke, stroke_width=width if stroke else None, **extra) + "/>"
+
+
+class _Fonts:
+    """Font families used by one document; embedded fonts are written once each."""
+
+    def __init__(self, embed: bool):
+        self.embed = embed
+        self.faces: Dict[str, str] = {}
+
+    def family(self, *fonts) -> str:
+        """font-family for text drawn with `fonts`: the profile's font, then its fallbacks."""
+        names = []
+        for font in fonts:
+            path = getattr(font, "path", None)
+            if not isinstance(path, str):
+                raise Unsupported("bitmap fallback font has no family to reference")
+            if self.embed:
+                names.append(self.faces.setdefault(path, f"f{len(self.faces)}"))
+            names.append(f"'{font.getname()[0]}'")
+        return ", ".join(dict.fromkeys(names + ["sans-serif"]))
+
+    def style(self) -> str:
+        rules = []
+        for path, alias in self.faces.items():
+            with open(path, "rb") as fh:
+                data = base64.b64encode(fh.read()).decode("ascii")
+            rules.append(f"@font-face{{font-family:{alias};src:url(data:font/ttf;base64,{data})}}")
+        return f"<style>{''.join(rules)}</style>" if rules else ""
+
+
+def _shape(it: Dict, fg: str) -> str:
+    sh = it["shape"]
+    width = it.get("width", 4)
+    color = it.get("color", fg)
+    if sh == "line":
+        x1, y1, x2, y2 = it.get("xyxy", [100, 100, 100, 200])
+        return "<line" + _attrs(x1=x1, y1=y1, x2=x2, y2=y2, stroke=color, stroke_width=width,
+                                **_dash(it, rebus_engine.LINE_DASH)) + "/>"
+    if sh == "box":
+        x1, y1, x2, y2 = it.get("xyxy", [300, 200, 800, 480])
+        return _rect(x1, y1, x2, y2, it.get("radius", 18), color, width,
+                     **_dash(it, rebus_engine.SHAPE_BOX_DASH))
+    raise Unsupported(f"shape {sh!r}")
+
+
+def _text(it: Dict, profile: Profile, w: int, h: int, fg: str, fonts: _Fonts) -> List[str]:
+    out = []
+    text, font, bbox, (tx, ty), runs, advance = place_text(it, profile, w, h)
+    used = dict.fromkeys([font] + [f for _, _, _, f in runs if f is not None])
+    tw, th = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    size = it.get("size", 64)
+    color = it.get("color", fg)
+
+    box = it.get("box")
+    if box:
+        pad = box.get("pad", 16)
+        dashed = {**it, **box, "dashed": box.get("dashed", it.get("dashed", False))}
+        out.append(_rect(tx - pad, ty - pad, tx + tw + pad, ty + th + pad, box.get("radius", 12),
+                         box.get("outline", color), box.get("width", 2), box.get("fill"),
+                         **_dash(dashed, rebus_engine.TEXT_BOX_DASH)))
+
+    # same origin and ink box as the raster engine (2px inset, rotation about the ink centre)
+    ox, oy = tx + 2, ty + 2
+    ink = [ox + bbox[0], oy + bbox[1], ox + bbox[2], oy + bbox[3]]
+    body = ["<text" + _attrs(x=ox, y=oy + font.getmetrics()[0], font_size=font.size,
+                             font_family=fonts.family(*used), fill=color,
+                             textLength=advance, lengthAdjust="spacingAndGlyphs")
+            + ">" + escape(text) + "</text>"]
+    if it.get("underline", False):
+        uw = max(2, size // 16)
+        uy = ty + th + 1
+        ink = [min(ink[0], tx), min(ink[1], uy - uw), max(ink[2], tx + tw), max(ink[3], uy + uw)]
+        body.append("<line" + _attrs(x1=tx, y1=uy, x2=tx + tw, y2=uy, stroke=color, stroke_width=uw) + "/>")
+
+    rotate = it.get("rotate", 0)
+    opacity = it.get("opacity", 255)
+    transform = None
+    if rotate:
+        lx, ly = int(ink[0]) - 2, int(ink[1]) - 2
+        cx = lx + (int(ink[2]) - lx + 3) / 2
+        cy = ly + (int(ink[3]) - ly + 3) / 2
+        transform = f"rotate({_n(-rotate)} {_n(cx)} {_n(cy)})"
+    if transform or opacity < 255 or len(body) > 1:
+        out.append("<g" + _attrs(transform=transform, opacity=round(opacity / 255, 3) if opacity < 255 else None)
+                   + ">" + "".join(body) + "</g>")
+    else:
+        out.extend(body)
+    return out
+
+
+def layout_to_svg(layout: List[Dict], profile: Profile, w: int = 1100, h: int = 650, bg: str = "#0b1220",
+                  fg: str = "#e7edf7", scale: float = 1.0, embed_fonts: bool = False) -> str:
+    """SVG document for `layout`; `scale` only sets the intrinsic width/height."""
+    fonts = _Fonts(embed_fonts)
+    b = profile.border
+    parts = [_rect(0, 0, w - 1, h - 1, 0, None, 0, bg), _rect(b, b, w - b, h - b, 24, fg, 2)]
+    for it in layout:
+        if "shape" in it:
+            parts.append(_shape(it, fg))
+        else:
+            parts.extend(_text(it, profile, w, h, fg, fonts))
+    head = ("<svg xmlns='http://www.w3.org/2000/svg'" + _attrs(viewBox=f"0 0 {w} {h}", width=round(w * scale),
+                                                                height=round(h * scale)) + ">")
+    return head + fonts.style() + "".join(parts) + "</svg>"
+
+
+def cached_svg(layout: List[Dict], profile: Profile, w: int = 1100, h: int = 650, bg: str = "#0b1220",
+               fg: str = "#e7edf7", scale: float = 1.0, embed_fonts: bool = False,
+               cache: RenderCache = RENDER_CACHE, label: str = "") -> Optional[str]:
+    """SVG text for `layout`, or None if it uses something SVG cannot express (render a raster instead).
+
+    A miss is timed as the "svg" stage, under `label` (the puzzle id).
+    """
+    key = layout_key(layout, backend="svg", renderer=profile, w=w, h=h, bg=bg, fg=fg, scale=scale,
+                     embed_fonts=embed_fonts)
+    data = cache.get(key)
+    if data is None:
+        try:
+            with rebus_metrics.context(app=profile.name, puzzle=label or key[:12]), rebus_metrics.span("svg"):
+                data = layout_to_svg(layout, profile, w, h, bg, fg, scale, embed_fonts).encode("utf-8")
+        except Unsupported:
+            data = b""                 # remembered, so the fallback decision is cached too
+        cache.put(key, data)
+    return data.decode("utf-8") or None
@@ -0,0 +1,49 @@
+import math
+import time
+from typing import Callable, Optional
+
+import streamlit as st
+
+import rebus_regions
+
+# ------------------------------
+# Round countdown
+# ------------------------------
+# The countdown is a fragment with run_every, so each tick reruns only the
+# timer widget. The rest of the script, including the puzzle image, does not
+# run. When time is up the expiry action runs once and the page does a
+# single full rerun to show its result; a finished timer stops ticking.
+# It is a page region (rebus_regions), so tick cost is recorded as "timer".
+
+TICK_S = 1.0
+
+
+def start_round():
+    st.session_state.round_started = time.time()
+    st.session_state.round_expired = False
+
+
+def remaining(seconds: int) -> int:
+    if "round_started" not in st.session_state:
+        start_round()
+    return max(0, math.ceil(seconds - (time.time() - st.session_state.round_started)))
+
+
+def _countdown(seconds: int, on_expire: Optional[Callable[[], None]]):
+    left = remaining(seconds)
+    st.metric("Time left", f"{left // 60}:{left % 60:02d}")
+    st.progress(left / seconds if seconds else 0.0)
+    if st.button("Restart ⏱", key="restart_timer"):
+        start_round()
+        st.rerun()                         # full rerun: a stopped timer has to be re-armed
+    if left == 0 and not st.session_state.round_expired:
+        st.session_state.round_expired = True
+        if on_expire is not None:
+            on_expire()
+        st.rerun()
+
+
+def countdown(seconds: int, on_expire: Optional[Callable[[], None]] = None):
+    """Countdown for the current round; calls `on_expire` once when it reaches zero."""
+    running = not st.session_state.get("round_expired", False)
+    rebus_regions.region("timer", run_every=TICK_S if running else None)(_countdown)(seconds, on_expire)
@@ -0,0 +1,19 @@
+import rebus_answers
+import rebus_pack_tech
+import rebus_packs
+
+
+def test_index_for_list_pack_does_not_scan_metas(monkeypatch):
+    first = rebus_answers.index_for(rebus_packs.ListPack(rebus_pack_tech.PUZZLES, "tech"))
+    rerun = rebus_packs.ListPack(rebus_pack_tech.PUZZLES, "tech")       # a new wrapper, as on every rerun
+    monkeypatch.setattr(rerun, "metas", lambda: (_ for _ in ()).throw(AssertionError("metas scanned")))
+    assert rebus_answers.index_for(rerun) is first
+
+
+def test_index_for_list_pack_rebuilds_when_list_grows():
+    puzzles = list(rebus_pack_tech.PUZZLES[:3])
+    first = rebus_answers.index_for(rebus_packs.ListPack(puzzles, "grows"))
+    puzzles.append(dict(rebus_pack_tech.PUZZLES[3]))
+    again = rebus_answers.index_for(rebus_packs.ListPack(puzzles, "grows"))
+    assert again is not first
+    assert again.lookup(rebus_pack_tech.PUZZLES[3]["answer"]) == (rebus_pack_tech.PUZZLES[3]["id"],)
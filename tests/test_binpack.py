@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+import rebus_binpack
+import rebus_pack_tech
+import rebus_packs
+
+
+@pytest.fixture
+def rbp(tmp_path):
+    path = str(tmp_path / "tech.rbp")
+    rebus_binpack.write_binpack(rebus_pack_tech.PUZZLES, path)
+    return path
+
+
+def test_metas_do_not_inflate_records(rbp, monkeypatch):
+    pack = rebus_binpack.BinPack(rbp)
+    monkeypatch.setattr(pack, "_read", lambda i: pytest.fail("record inflated for metadata"))
+    expected = [{k: p.get(k, "") for k in ("id", "answer", "hint")} for p in rebus_pack_tech.PUZZLES]
+    assert list(pack.metas()) == expected
+    assert pack.meta(3) == expected[3]
+
+
+def test_negative_index_like_other_packs(rbp):
+    pack = rebus_binpack.BinPack(rbp)
+    assert pack[-1] == pack[len(pack) - 1]
+    assert pack[-1]["id"] == rebus_packs.ListPack(rebus_pack_tech.PUZZLES)[-1]["id"]
+    with pytest.raises(IndexError):
+        pack[-len(pack) - 1]
+
+
+def test_reopen_keeps_old_pack_usable(rbp):
+    old = rebus_packs.open_pack(rbp)
+    rebus_binpack.write_binpack(rebus_pack_tech.PUZZLES[:5], rbp)
+    os.utime(rbp, ns=(1, 1))                        # a new stamp even on coarse-mtime filesystems
+    new = rebus_packs.open_pack(rbp)
+    assert new is not old and len(new) == 5
+    assert old[len(old) - 1]["id"] == rebus_pack_tech.PUZZLES[-1]["id"]
+
+
+def test_other_versions_are_rejected(rbp):
+    with open(rbp, "r+b") as fh:
+        fh.seek(4)
+        fh.write((rebus_binpack.VERSION - 1).to_bytes(2, "little"))
+    with pytest.raises(ValueError, match="rebus_binpack.py convert"):
+        rebus_binpack.BinPack(rbp)
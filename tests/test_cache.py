@@ -0,0 +1,12 @@
+from rebus_cache import RenderCache
+
+
+def test_clear_resets_counters():
+    cache = RenderCache(10)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")                           # evicts "a"
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats() == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0, "max_bytes": 10}
@@ -0,0 +1,22 @@
+import pytest
+
+import rebus_emoji
+import rebus_engine
+
+
+@pytest.mark.parametrize("text", ["→", "↔", "A → B ↔ C"])
+def test_text_symbols_render_with_the_font(text):
+    cl = rebus_engine.compile_layout([{"text": text, "xy": [550, 325], "size": 64}], rebus_engine.TECH)
+    assert not any(isinstance(c, (rebus_engine.Sprite, rebus_engine.Coverage)) for c in cl.commands)
+    assert [c.text for c in cl.commands if isinstance(c, rebus_engine.Text)] == [text]
+
+
+@pytest.mark.parametrize("text, emoji", [
+    ("\U0001f9f9", ["\U0001f9f9"]),                          # Emoji_Presentation
+    ("\u25b6\ufe0f go", ["\u25b6\ufe0f"]),                     # text symbol + U+FE0F
+    ("\U0001f469\u200d\U0001f4bb", ["\U0001f469\u200d\U0001f4bb"]),  # ZWJ sequence
+    ("1\ufe0f\u20e3 \U0001f1eb\U0001f1f7", ["1\ufe0f\u20e3", "\U0001f1eb\U0001f1f7"]),   # keycap, flag
+    ("\u25b6 \u25c0 \u2716 \u2197", []),                     # text presentation: ▶ ◀ ✖ ↗
+])
+def test_split_only_takes_emoji_presentation(text, emoji):
+    assert [run for is_emoji, run in rebus_emoji.split(text) if is_emoji] == emoji
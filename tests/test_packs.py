@@ -0,0 +1,18 @@
+import pytest
+
+import rebus_packs
+
+
+def test_export_without_names_writes_every_builtin(tmp_path, capsys):
+    rebus_packs.main(["export", "--out", str(tmp_path)])
+    for name in rebus_packs.BUILTIN:
+        pack = rebus_packs.FilePack(rebus_packs.pack_path(name, str(tmp_path)))
+        assert len(pack) > 0
+        pack.close()
+    assert capsys.readouterr().out.count("puzzles ->") == len(rebus_packs.BUILTIN)
+
+
+def test_export_rejects_unknown_pack(tmp_path):
+    with pytest.raises(SystemExit):
+        rebus_packs.main(["export", "--out", str(tmp_path), "tech", "nope"])
+    assert not list(tmp_path.iterdir())
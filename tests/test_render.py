@@ -0,0 +1,35 @@
+"""Tech and hard renders are pinned by pixel hash; any change to how they look fails here.
+
+After an intended change (or a Pillow/FreeType upgrade), look at the renders, then refresh the pins:
+
+    python tests/test_render.py > tests/render_hashes.json
+"""
+import hashlib
+import json
+import os
+
+import pytest
+
+import rebus_batch
+
+HASHES = os.path.join(os.path.dirname(__file__), "render_hashes.json")
+PACKS = ("tech", "hard")
+
+
+def render_hashes(name: str):
+    pack = rebus_batch.load_pack(name)
+    draw = getattr(pack, rebus_batch.PACKS[name][1])
+    return {p["id"]: hashlib.sha256(draw(p["layout"]).convert("RGB").tobytes()).hexdigest()[:16]
+            for p in pack.PUZZLES}
+
+
+@pytest.mark.parametrize("name", PACKS)
+def test_renders_match_pins(name):
+    with open(HASHES, encoding="utf-8") as fh:
+        pinned = json.load(fh)[name]
+    got = render_hashes(name)
+    assert sorted(pid for pid in got if got[pid] != pinned.get(pid)) == []
+
+
+if __name__ == "__main__":
+    print(json.dumps({name: render_hashes(name) for name in PACKS}, indent=1, sort_keys=True))
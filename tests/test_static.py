@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+import rebus_static
+
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(rebus_static, "STATIC_DIR", str(tmp_path))
+    monkeypatch.setattr(rebus_static, "_published", {})
+    monkeypatch.setattr(rebus_static, "_since_prune", float("inf"))
+    return tmp_path
+
+
+def _png(i: int, size: int = 1000) -> bytes:
+    return b"\x89PNG" + i.to_bytes(4, "big") + bytes(size - 8)
+
+
+def test_missing_file_is_written_again(static_dir):
+    url = rebus_static.publish("k", _png(1))
+    (path,) = static_dir.iterdir()
+    os.remove(path)
+    assert not rebus_static.is_published("k")
+    assert rebus_static.publish("k", _png(1)) == url
+    assert path.read_bytes() == _png(1)
+
+
+def test_budget_is_enforced_after_the_first_publish(static_dir, monkeypatch):
+    monkeypatch.setattr(rebus_static, "BUDGET_MB", 3000 / 2**20)
+    for i in range(10):
+        rebus_static.publish(f"k{i}", _png(i))
+        os.utime(next(p for p in static_dir.iterdir() if p.read_bytes() == _png(i)), ns=(i, i))
+    sizes = [p.stat().st_size for p in static_dir.iterdir()]
+    assert sum(sizes) <= 3000 + 1000                    # the budget, plus the image written after the last prune
+    assert rebus_static.is_published("k9") and not rebus_static.is_published("k0")
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+import rebus_stroke
+
+LINE = np.array([[0.0, 0.0], [100.0, 0.0]])
+
+
+def _spans(runs):
+    return [(round(r[0, 0], 6), round(r[-1, 0], 6)) for r in runs]
+
+
+@pytest.mark.parametrize("offset", [45, 30 + 45, 3 * 30 + 7, -15])
+def test_offset_beyond_one_period(offset):
+    period = 20 + 10
+    got = _spans(rebus_stroke.dash_runs(LINE, (20, 10), offset))
+    assert got == _spans(rebus_stroke.dash_runs(LINE, (20, 10), offset % period))
+    assert got[-1][0] >= 100 - period               # the last period of the path still has its dash